@@ -202,7 +202,19 @@ void OBCBridge::processCommand(const char* cmd) {
     String cmdStr(cmd);
     cmdStr.toUpperCase();  // Case-insensitive commands
 
-    if (cmdStr.startsWith("GET_FILE ")) {
+    if (cmdStr.startsWith("GET_FILE_BIN ")) {
+        // Extract filename after "GET_FILE_BIN "
+        String filename = String(cmd).substring(13);
+        filename.trim();
+
+        Serial.print("Binary file transfer request: ");
+        Serial.println(filename);
+
+        if (!transferFileBinary(filename.c_str())) {
+            Serial1.println("ERROR: File transfer failed");
+        }
+    }
+    else if (cmdStr.startsWith("GET_FILE ")) {
         // Extract filename after "GET_FILE "
         String filename = String(cmd).substring(9);
         filename.trim();
@@ -320,6 +332,107 @@ bool OBCBridge::transferFile(const char* filename) {
     return true;
 }
 
+/**
+ * @brief Transfer a file from SD card to PC/OBC as raw binary.
+ *
+ * Same framing as transferFile(), but the payload is sent as raw bytes
+ * followed by a little-endian CRC-32 (zlib polynomial) instead of hex,
+ * halving the number of bytes on the wire.
+ *
+ * @param filename Name of the file on SD card to transfer.
+ * @return true if transfer successful, false otherwise.
+ */
+bool OBCBridge::transferFileBinary(const char* filename) {
+    if (!Serial1) {
+        Serial.println("❌ UART not initialized!");
+        return false;
+    }
+
+    // Check if SD card is available
+    if (!SD.begin(BUILTIN_SDCARD)) {
+        Serial.println("❌ SD Card not available!");
+        Serial1.println("ERROR: SD card not available");
+        return false;
+    }
+
+    // Open the file
+    File dataFile = SD.open(filename, FILE_READ);
+    if (!dataFile) {
+        Serial.print("❌ Failed to open file: ");
+        Serial.println(filename);
+        Serial1.println("ERROR: File not found");
+        return false;
+    }
+
+    // Get file size
+    size_t fileSize = dataFile.size();
+
+    Serial.println("──────────────────────────────────────────────");
+    Serial.print("📁 Transferring file (binary): ");
+    Serial.println(filename);
+    Serial.print("   Size: ");
+    Serial.print(fileSize);
+    Serial.println(" bytes");
+
+    // Send file transfer start marker
+    Serial1.println("FILE_BIN_START");
+    Serial1.println(filename);
+    Serial1.println(fileSize);
+
+    // Transfer file in raw chunks, updating the running CRC
+    uint8_t buffer[FILE_CHUNK_SIZE];
+    size_t bytesTransferred = 0;
+    uint32_t crc = 0xFFFFFFFF;
+
+    while (dataFile.available()) {
+        size_t bytesRead = dataFile.read(buffer, FILE_CHUNK_SIZE);
+        Serial1.write(buffer, bytesRead);
+        crc = updateCrc32(crc, buffer, bytesRead);
+        bytesTransferred += bytesRead;
+    }
+
+    // Send CRC-32 (little-endian) and end marker
+    crc ^= 0xFFFFFFFF;
+    uint8_t crcBytes[4] = {
+        (uint8_t)(crc & 0xFF),
+        (uint8_t)((crc >> 8) & 0xFF),
+        (uint8_t)((crc >> 16) & 0xFF),
+        (uint8_t)((crc >> 24) & 0xFF)
+    };
+    Serial1.write(crcBytes, 4);
+    Serial1.println();
+    Serial1.println("FILE_END");
+    Serial1.flush();
+
+    // Close file
+    dataFile.close();
+
+    Serial.println("✅ File transfer complete.");
+    Serial.print("   Total bytes sent: ");
+    Serial.println(bytesTransferred);
+    Serial.println("──────────────────────────────────────────────");
+
+    return true;
+}
+
+/**
+ * @brief Update a running CRC-32 (reflected 0xEDB88320, as used by zlib).
+ *
+ * @param crc Running CRC value (start with 0xFFFFFFFF).
+ * @param data Bytes to add.
+ * @param length Number of bytes.
+ * @return Updated CRC value (XOR with 0xFFFFFFFF to finalize).
+ */
+uint32_t OBCBridge::updateCrc32(uint32_t crc, const uint8_t* data, size_t length) {
+    for (size_t i = 0; i < length; i++) {
+        crc ^= data[i];
+        for (int bit = 0; bit < 8; bit++) {
+            crc = (crc >> 1) ^ (0xEDB88320 & (0 - (crc & 1)));
+        }
+    }
+    return crc;
+}
+
 /**
  * @brief List all files on the SD card root directory.
  *
@@ -91,6 +91,7 @@ public:
      *
      * Supported commands:
      *  - "GET_FILE <filename>" - Transfer a file from SD card
+     *  - "GET_FILE_BIN <filename>" - Transfer a file as raw binary
      *  - "LIST_FILES" - List files on SD card
      *
      * @return true if a command was received and processed.
@@ -116,6 +117,21 @@ public:
      */
     bool transferFile(const char* filename);
 
+    /**
+     * @brief Transfer a file from SD card to PC/OBC as raw binary.
+     *
+     * Format:
+     *   FILE_BIN_START
+     *   <filename>
+     *   <file_size_in_bytes>
+     *   <file_size raw bytes><4-byte little-endian CRC-32>
+     *   FILE_END
+     *
+     * @param filename Name of the file on SD card to transfer.
+     * @return true if transfer successful, false otherwise.
+     */
+    bool transferFileBinary(const char* filename);
+
     /**
      * @brief List all files on the SD card root directory.
      *
@@ -146,6 +162,16 @@ private:
      * @param cmd Command string to process.
      */
     void processCommand(const char* cmd);
+
+    /**
+     * @brief Update a running CRC-32 over a block of bytes.
+     *
+     * @param crc Running CRC value.
+     * @param data Bytes to add.
+     * @param length Number of bytes.
+     * @return Updated CRC value.
+     */
+    uint32_t updateCrc32(uint32_t crc, const uint8_t* data, size_t length);
 };
 
 #endif // __OBCBridge_h_
@@ -12,6 +12,7 @@ Usage:
 
 import sys
 import csv
+import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
@@ -23,6 +24,22 @@ DEFAULT_PATH = Path("spectrum.csv")
 # -----------------------------------------------------------------------------
 def load_csv(file_path: Path):
     """Load CSV data (Pixel,Intensity) from file."""
+    try:
+        # Fast path: parse the whole file in C
+        data = np.loadtxt(file_path, delimiter=",", skiprows=1, usecols=(0, 1), ndmin=2)
+        pixels, intensity = data[:, 0].astype(int), data[:, 1]
+    except ValueError:
+        # Slow path: row-by-row so malformed lines can be skipped
+        pixels, intensity = load_csv_rows(file_path)
+
+    if not len(pixels):
+        raise ValueError("No valid data found in CSV file.")
+
+    return pixels, intensity
+
+
+def load_csv_rows(file_path: Path):
+    """Load CSV data row by row, skipping malformed lines."""
     pixels, intensity = [], []
 
     with open(file_path, "r") as f:
@@ -31,12 +48,9 @@ def load_csv(file_path: Path):
             try:
                 pixels.append(int(row["Pixel"]))
                 intensity.append(float(row["Intensity"]))
-            except (ValueError, KeyError):
+            except (ValueError, KeyError, TypeError):
                 continue  # skip malformed lines
 
-    if not pixels:
-        raise ValueError("No valid data found in CSV file.")
-
     return pixels, intensity
 
 
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Aggregate VIA spectra across a session directory
+
+Reads every Pixel,Intensity CSV in a session folder one file at a time
+and writes per-pixel mean/min/max intensity to a summary CSV. Only one
+spectrum plus the running totals is held in memory, so cost grows
+linearly with the number of measurements.
+
+Output: <session_dir>/VIA.<session>.summary.csv
+    Pixel,Mean,Min,Max
+
+Usage:
+    python3 aggregate_session.py <session_dir>
+
+Example:
+    python3 aggregate_session.py ~/Aeris/data/via/20251108.1845
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+
+def load_spectrum(csv_path):
+    """Load the Intensity column of a Pixel,Intensity CSV, or None if not one"""
+    with open(csv_path, 'r') as f:
+        if f.readline().strip() != "Pixel,Intensity":
+            return None  # Hex CSV or other file - not a spectrum
+        return np.loadtxt(f, delimiter=",", usecols=1, ndmin=1)
+
+def aggregate_session(session_dir):
+    """Write per-pixel mean/min/max over all spectra in session_dir"""
+
+    session_path = Path(session_dir)
+    if not session_path.is_dir():
+        print(f"❌ Session directory not found: {session_dir}")
+        return
+
+    summary_path = session_path / f"VIA.{session_path.name}.summary.csv"
+
+    print(f"📁 Processing: {session_path}")
+    print()
+
+    total = low = high = None
+    count = 0
+
+    for csv_path in sorted(session_path.glob("VIA.*.csv")):
+        if csv_path == summary_path:
+            continue
+
+        try:
+            intensity = load_spectrum(csv_path)
+        except ValueError as e:
+            print(f"⚠️ Skipping {csv_path.name}: {e}")
+            continue
+        if intensity is None:
+            continue
+
+        if total is None:
+            total = intensity.copy()
+            low = intensity.copy()
+            high = intensity.copy()
+        elif len(intensity) != len(total):
+            print(f"⚠️ Skipping {csv_path.name}: {len(intensity)} pixels, expected {len(total)}")
+            continue
+        else:
+            total += intensity
+            np.minimum(low, intensity, out=low)
+            np.maximum(high, intensity, out=high)
+
+        count += 1
+        print(f"✅ {csv_path.name}")
+
+    if not count:
+        print("❌ No spectrum CSV files found")
+        return
+
+    pixels = np.arange(len(total))
+    np.savetxt(summary_path, np.column_stack((pixels, total / count, low, high)),
+               fmt=("%d", "%.2f", "%d", "%d"), delimiter=",",
+               header="Pixel,Mean,Min,Max", comments="")
+
+    print()
+    print(f"📊 Aggregated {count} spectra")
+    print(f"💾 Summary: {summary_path.name}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 aggregate_session.py <session_dir>")
+        print("\nExample:")
+        print("  python3 aggregate_session.py ~/Aeris/data/via/20251108.1845")
+        sys.exit(1)
+
+    aggregate_session(sys.argv[1])
@@ -9,15 +9,25 @@ Usage:
     python3 capture_measurement.py /dev/ttyACM0 output.csv
 """
 
+import os
+import re
 import serial
 import sys
 import time
+from via_serial import read_lines
+
+# Give up if the port stays silent this long (seconds)
+IDLE_TIMEOUT = 30
+
+# CSV section markers, dispatched on match.lastindex
+MARKERS = re.compile(rb'(CSV DATA OUTPUT:)|(END CSV DATA)')
+CSV_START, CSV_END = 1, 2
 
 def capture_measurement(port, output_file):
     """Send VIA_MEASURE command and capture CSV data"""
 
     print(f"Opening serial port: {port}")
-    ser = serial.Serial(port, 115200, timeout=10)
+    ser = serial.Serial(port, 115200, timeout=IDLE_TIMEOUT)
     time.sleep(1)  # Wait for serial to stabilize
 
     # Clear any pending data
@@ -32,37 +42,56 @@ def capture_measurement(port, output_file):
 
     # Wait for CSV data to start
     csv_started = False
-    csv_data = []
-
-    while True:
-        if ser.in_waiting > 0:
-            line = ser.readline().decode('utf-8', errors='ignore').strip()
+    csv_complete = False
+    csv_file = None
+    partial_file = f"{output_file}.partial"
+    row_count = 0
 
+    try:
+        for line in read_lines(ser, IDLE_TIMEOUT):
             # Print all output to terminal
-            print(line)
+            print(line.decode('utf-8', errors='ignore'))
+
+            match = MARKERS.search(line)
+            marker = match.lastindex if match else None
 
             # Check for CSV data markers
-            if "CSV DATA OUTPUT:" in line:
+            if marker == CSV_START:
                 csv_started = True
-                csv_data = []  # Reset
+                if csv_file is None:
+                    # Rows go to a temp file beside the output, renamed into place at END
+                    csv_file = open(partial_file, 'wb')
+                else:
+                    # Restarted output - discard what was written so far
+                    csv_file.seek(0)
+                    csv_file.truncate()
+                row_count = 0
                 continue
 
-            if "END CSV DATA" in line:
+            if marker == CSV_END:
+                csv_complete = True
                 break
 
-            # Capture CSV lines
-            if csv_started and line and ',' in line:
-                csv_data.append(line)
-
-    ser.close()
-
-    # Save to file
-    if csv_data:
-        with open(output_file, 'w') as f:
-            f.write('\n'.join(csv_data) + '\n')
-        
+            # Capture CSV lines straight to the temp file
+            if csv_started and line and b',' in line:
+                csv_file.write(line + b'\n')
+                row_count += 1
+        else:
+            print(f"\n⏱ No data for {IDLE_TIMEOUT} seconds, giving up")
+    finally:
+        ser.close()
+        if csv_file is not None:
+            csv_file.close()
+            if csv_complete and row_count:
+                os.replace(partial_file, output_file)
+            else:
+                os.remove(partial_file)  # Never leave a partial capture behind
+
+    if csv_complete and row_count:
         print(f"\n✅ Measurement data saved to: {output_file}")
-        print(f"   Total rows: {len(csv_data)}")
+        print(f"   Total rows: {row_count}")
+    elif row_count:
+        print(f"\n❌ CSV data incomplete ({row_count} rows, no END CSV DATA) - nothing saved")
     else:
         print("\n❌ No CSV data captured!")
 
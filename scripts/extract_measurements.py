@@ -3,7 +3,8 @@
 Extract CSV/TXT measurements from VIA log files
 
 Takes a VIA session log file and extracts clean CSV/TXT data files
-for each measurement found in the log.
+for each measurement found in the log, plus a .bin file holding the
+decoded raw measurement bytes.
 
 Usage:
     python3 extract_measurements.py <log_file>
@@ -14,9 +15,39 @@ Example:
 
 import sys
 import re
+import mmap
 from pathlib import Path
 from datetime import datetime
 
+# Measurement boundary markers, dispatched on match.lastindex
+MARKERS = re.compile(rb'(Reading full 4106-byte measurement)|(Full 4106 bytes received)')
+MEASUREMENT_START, MEASUREMENT_END = 1, 2
+
+# Characters allowed in a hex line; a hex line translates to b'' with these deleted
+HEX_LINE_CHARS = b'0123456789ABCDEFabcdef '
+
+# Turns a whole TXT hex body into its CSV form in one pass
+SPACE_TO_COMMA = bytes.maketrans(b' ', b',')
+
+# Frame written around every measurement body
+VIA_START = b"===VIA START===\n"
+VIA_STOP = b"===VIA STOP===\n"
+
+def find_measurement_regions(mm):
+    """Yield the byte region between each start/end marker pair
+
+    Each region runs from the line after the start marker up to (not
+    including) the line holding the end marker.
+    """
+    region_start = None
+    for match in MARKERS.finditer(mm):
+        if match.lastindex == MEASUREMENT_START:
+            region_start = mm.find(b'\n', match.end()) + 1 or len(mm)
+        elif region_start is not None:
+            region_end = mm.rfind(b'\n', region_start, match.start()) + 1
+            yield mm[region_start:region_end]
+            region_start = None
+
 def extract_measurements_from_log(log_file_path):
     """Extract measurements from log and create CSV/TXT files"""
 
@@ -31,63 +62,59 @@ def extract_measurements_from_log(log_file_path):
     print(f"📂 Output dir: {session_dir}")
     print()
 
-    with open(log_path, 'r') as f:
-        lines = f.readlines()
-
-    reading_measurement = False
-    hex_lines = []
     measurement_count = 0
 
-    for line in lines:
-        line = line.strip()
-
-        # Detect start of measurement
-        if "Reading full 4106-byte measurement" in line:
-            reading_measurement = True
-            hex_lines = []
-            continue
-
-        # Detect end of measurement
-        if "Full 4106 bytes received" in line and reading_measurement:
-            if hex_lines:
-                measurement_count += 1
-
-                # Generate filenames with incrementing counter
-                base_timestamp = log_path.stem  # VIA.20251108.1845
-                csv_name = f"{base_timestamp}.{measurement_count:02d}.csv"
-                txt_name = f"{base_timestamp}.{measurement_count:02d}.txt"
-
-                csv_path = session_dir / csv_name
-                txt_path = session_dir / txt_name
-
-                # Write CSV (comma-separated)
-                with open(csv_path, 'w') as f:
-                    f.write("===VIA START===\n")
-                    for hex_line in hex_lines:
-                        csv_line = hex_line.replace(' ', ',')
-                        f.write(csv_line + '\n')
-                    f.write("===VIA STOP===\n")
-
-                # Write TXT (space-separated)
-                with open(txt_path, 'w') as f:
-                    f.write("===VIA START===\n")
-                    for hex_line in hex_lines:
-                        f.write(hex_line + '\n')
-                    f.write("===VIA STOP===\n")
-
-                print(f"✅ Measurement {measurement_count}:")
-                print(f"   CSV: {csv_name}")
-                print(f"   TXT: {txt_name}")
-
-            reading_measurement = False
-            hex_lines = []
-            continue
-
-        # Capture hex lines
-        if reading_measurement:
-            # Check if line is all hex digits and spaces
-            if line and all(c in '0123456789ABCDEFabcdef ' for c in line):
-                hex_lines.append(line)
+    # Empty logs can't be mapped (and hold no measurements anyway)
+    if log_path.stat().st_size == 0:
+        print(f"📊 Extracted 0 measurements")
+        return
+
+    with open(log_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for region in find_measurement_regions(mm):
+            # Capture hex lines (all hex digits and spaces)
+            hex_body = bytearray()
+            for line in region.splitlines():
+                line = line.strip()
+                if line and not line.translate(None, HEX_LINE_CHARS):
+                    hex_body += line + b'\n'
+
+            if not hex_body:
+                continue
+
+            measurement_count += 1
+
+            # Generate filenames with incrementing counter
+            base_timestamp = log_path.stem  # VIA.20251108.1845
+            csv_name = f"{base_timestamp}.{measurement_count:02d}.csv"
+            txt_name = f"{base_timestamp}.{measurement_count:02d}.txt"
+            bin_name = f"{base_timestamp}.{measurement_count:02d}.bin"
+
+            csv_path = session_dir / csv_name
+            txt_path = session_dir / txt_name
+            bin_path = session_dir / bin_name
+
+            # Write CSV (comma-separated, one translate pass over the body)
+            with open(csv_path, 'wb') as out:
+                out.write(b"".join((VIA_START, hex_body.translate(SPACE_TO_COMMA), VIA_STOP)))
+
+            # Write TXT (space-separated)
+            with open(txt_path, 'wb') as out:
+                out.write(b"".join((VIA_START, hex_body, VIA_STOP)))
+
+            print(f"✅ Measurement {measurement_count}:")
+            print(f"   CSV: {csv_name}")
+            print(f"   TXT: {txt_name}")
+
+            # Write BIN (whole body decoded in one C-level fromhex call); a corrupt
+            # hex line (odd nibble count, stray token) skips only this file
+            try:
+                raw = bytes.fromhex(hex_body.decode('ascii'))
+            except ValueError as e:
+                print(f"   ⚠️ BIN skipped: corrupt hex data ({e})")
+            else:
+                bin_path.write_bytes(raw)
+                print(f"   BIN: {bin_name}")
 
     print()
     print(f"📊 Extracted {measurement_count} measurements")
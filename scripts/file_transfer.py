@@ -9,7 +9,8 @@ downloading files from the SD card using a simple command protocol.
 
 Commands:
   - LIST_FILES: List all files on the SD card
-  - GET_FILE <filename>: Download a specific file from SD card
+  - GET_FILE_BIN <filename>: Download a file as raw bytes + CRC-32
+  - GET_FILE <filename>: Download a file as hex (legacy fallback)
 
 Usage:
     python3 file_transfer.py /dev/ttyACM0           # Interactive mode
@@ -23,6 +24,7 @@ Date: 2025
 import sys
 import serial
 import time
+import zlib
 from pathlib import Path
 from typing import Optional
 
@@ -32,6 +34,7 @@ from typing import Optional
 BAUD_RATE = 115200
 TIMEOUT = 5.0  # seconds
 DEFAULT_PORT = "/dev/ttyACM0"  # Teensy typically appears here on Linux
+BINARY_CHUNK_SIZE = 4096  # Bytes per read during binary transfers
 
 # -----------------------------------------------------------------------------
 # SERIAL CONNECTION
@@ -125,6 +128,39 @@ class VIAFileTransfer:
             if timeout is not None:
                 self.ser.timeout = old_timeout
 
+    def read_until(self, terminator: bytes, timeout: float = TIMEOUT) -> bytes:
+        """Read from serial port in bulk chunks until terminator.
+
+        Args:
+            terminator: Byte string that ends the read
+            timeout: Seconds of silence allowed between chunks
+
+        Returns:
+            Bytes read, ending with terminator
+
+        Raises:
+            TimeoutError: If the line goes quiet before the terminator arrives
+        """
+        data = bytearray()
+        old_timeout = self.ser.timeout
+        self.ser.timeout = timeout
+
+        try:
+            while True:
+                # Take everything already buffered, or block for the next byte
+                chunk = self.ser.read(max(1, self.ser.in_waiting))
+                if not chunk:
+                    raise TimeoutError(f"no {terminator.decode()} after {len(data)} bytes")
+
+                # Only rescan the tail a split terminator could straddle
+                search_from = max(0, len(data) - len(terminator) + 1)
+                data += chunk
+                end = data.find(terminator, search_from)
+                if end >= 0:
+                    return bytes(data[:end + len(terminator)])
+        finally:
+            self.ser.timeout = old_timeout
+
     def list_files(self):
         """Request and display list of files on SD card."""
         print("\n" + "="*60)
@@ -155,12 +191,18 @@ class VIAFileTransfer:
         print("\nFiles on SD card:")
         print("-" * 60)
 
+        # Read the whole listing in bulk chunks and split it once
+        try:
+            payload = self.read_until(b"LIST_END")
+        except TimeoutError as e:
+            print(f"⏱ Timeout reading file list ({e})")
+            return
+
         file_count = 0
-        while True:
-            line = self.read_line(timeout=2.0)
+        for line in payload.decode('ascii', errors='ignore').splitlines():
+            line = line.strip()
             if not line:
-                print("⏱ Timeout reading file list")
-                break
+                continue
 
             print(f"📥 {line}")
 
@@ -196,25 +238,18 @@ class VIAFileTransfer:
         print(f"Downloading file: {filename}")
         print("="*60)
 
-        self.send_command(f"GET_FILE {filename}")
-
-        # Wait for FILE_START marker
-        waiting = True
-        start_time = time.time()
-
-        while waiting and (time.time() - start_time) < TIMEOUT:
-            line = self.read_line(timeout=1.0)
-            if line:
-                print(f"📥 {line}")
-                if line == "FILE_START":
-                    waiting = False
-                elif line.startswith("ERROR"):
-                    print(f"❌ {line}")
-                    return
+        # Prefer raw binary transfer; legacy firmware rejects GET_FILE_BIN
+        marker = self._request_file(f"GET_FILE_BIN {filename}")
+        if marker == "ERROR: Unknown command":
+            print("ℹ️ Binary transfer not supported, falling back to hex")
+            marker = self._request_file(f"GET_FILE {filename}")
 
-        if waiting:
+        if marker is None:
             print("⏱ Timeout waiting for file transfer")
             return
+        if marker.startswith("ERROR"):
+            print(f"❌ {marker}")
+            return
 
         # Read filename confirmation
         remote_filename = self.read_line(timeout=2.0)
@@ -236,11 +271,76 @@ class VIAFileTransfer:
             print(f"❌ Invalid file size: {file_size_str}")
             return
 
-        # Read hex-encoded file data
         print("\nReceiving data...")
-        hex_data = ""
+        if marker == "FILE_BIN_START":
+            binary_data = self._receive_binary(file_size)
+        else:
+            binary_data = self._receive_hex(file_size)
+        if binary_data is None:
+            return
+
+        print(f"\n✅ Received {len(binary_data)} bytes")
+
+        # Verify size
+        if len(binary_data) != file_size:
+            print(f"⚠️ Warning: Size mismatch! Expected {file_size}, got {len(binary_data)}")
+
+        # Save to file
+        try:
+            output_file = Path(output_path)
+            with open(output_file, 'wb') as f:
+                f.write(binary_data)
+            print(f"💾 Saved to: {output_file.resolve()}")
+            print("="*60 + "\n")
+        except IOError as e:
+            print(f"❌ Failed to save file: {e}")
+
+    def _request_file(self, command: str) -> Optional[str]:
+        """Send a file request and wait for its start marker.
+
+        Args:
+            command: GET_FILE or GET_FILE_BIN command string
+
+        Returns:
+            "FILE_START", "FILE_BIN_START", an ERROR line, or None on timeout
+        """
+        self.send_command(command)
+
+        start_time = time.time()
+        while (time.time() - start_time) < TIMEOUT:
+            line = self.read_line(timeout=1.0)
+            if line:
+                print(f"📥 {line}")
+                if line in ("FILE_START", "FILE_BIN_START") or line.startswith("ERROR"):
+                    return line
+
+        return None
+
+    @staticmethod
+    def _progress_step(file_size: int) -> int:
+        """Bytes between progress reports (every 10% of the file)."""
+        return max(1, file_size // 10)
+
+    def _report_progress(self, bytes_received: int, file_size: int) -> int:
+        """Print transfer progress and return the byte count for the next report."""
+        progress = (bytes_received * 100) // file_size if file_size > 0 else 0
+        print(f"  Progress: {progress}% ({bytes_received}/{file_size} bytes)")
+        step = self._progress_step(file_size)
+        return (bytes_received // step + 1) * step
+
+    def _receive_hex(self, file_size: int) -> Optional[bytearray]:
+        """Receive hex-encoded file data up to the FILE_END marker.
+
+        Args:
+            file_size: Expected file size in bytes (for progress)
+
+        Returns:
+            Decoded file data, or None on error
+        """
+        binary_data = bytearray()
+        odd_digit = ""  # Trailing nibble when a read ends mid-byte
         bytes_received = 0
-        last_progress = 0
+        next_report = self._progress_step(file_size)
 
         while True:
             line = self.read_line(timeout=10.0)
@@ -253,40 +353,71 @@ class VIAFileTransfer:
                 break
             elif line.startswith("ERROR"):
                 print(f"❌ {line}")
-                return
+                return None
             else:
-                # Accumulate hex data
-                hex_data += line.replace(" ", "")
+                # Decode hex straight into the output buffer
+                hex_chunk = odd_digit + line.replace(" ", "")
+                even_len = len(hex_chunk) & ~1
+                odd_digit = hex_chunk[even_len:]
+                try:
+                    binary_data += bytes.fromhex(hex_chunk[:even_len])
+                except ValueError as e:
+                    print(f"❌ Failed to decode hex data: {e}")
+                    return None
 
-                # Calculate progress
-                bytes_received = len(hex_data) // 2
-                progress = (bytes_received * 100) // file_size if file_size > 0 else 0
+                bytes_received += even_len // 2
+                if bytes_received >= next_report:
+                    next_report = self._report_progress(bytes_received, file_size)
 
-                if progress >= last_progress + 10:
-                    print(f"  Progress: {progress}% ({bytes_received}/{file_size} bytes)")
-                    last_progress = progress
+        return binary_data
 
-        # Convert hex to binary
-        try:
-            binary_data = bytes.fromhex(hex_data)
-            print(f"\n✅ Received {len(binary_data)} bytes")
-        except ValueError as e:
-            print(f"❌ Failed to decode hex data: {e}")
-            return
+    def _receive_binary(self, file_size: int) -> Optional[bytearray]:
+        """Receive raw file data followed by a CRC-32 and FILE_END.
 
-        # Verify size
-        if len(binary_data) != file_size:
-            print(f"⚠️ Warning: Size mismatch! Expected {file_size}, got {len(binary_data)}")
+        Args:
+            file_size: Number of payload bytes to read
 
-        # Save to file
+        Returns:
+            File data, or None on timeout or CRC mismatch
+        """
+        # Payload plus trailing little-endian CRC-32, read in place
+        buf = bytearray(file_size + 4)
+        view = memoryview(buf)
+        received = 0
+        next_report = self._progress_step(file_size)
+
+        old_timeout = self.ser.timeout
+        self.ser.timeout = 10.0
         try:
-            output_file = Path(output_path)
-            with open(output_file, 'wb') as f:
-                f.write(binary_data)
-            print(f"💾 Saved to: {output_file.resolve()}")
-            print("="*60 + "\n")
-        except IOError as e:
-            print(f"❌ Failed to save file: {e}")
+            while received < len(buf):
+                n = self.ser.readinto(view[received:received + BINARY_CHUNK_SIZE])
+                if not n:
+                    print("⏱ Timeout receiving data")
+                    return None
+                received += n
+
+                if received >= next_report and file_size > 0:
+                    next_report = self._report_progress(min(received, file_size), file_size)
+        finally:
+            self.ser.timeout = old_timeout
+
+        data = buf[:file_size]
+        expected_crc = int.from_bytes(view[file_size:], 'little')
+        actual_crc = zlib.crc32(data)
+        if actual_crc != expected_crc:
+            print(f"❌ CRC mismatch! Expected {expected_crc:08X}, got {actual_crc:08X}")
+            return None
+
+        # Consume the end-of-payload newline and FILE_END marker
+        line = self.read_line(timeout=2.0)
+        if line is None:
+            line = self.read_line(timeout=2.0)
+        if line == "FILE_END":
+            print(f"📥 {line}")
+        else:
+            print(f"⚠️ Expected FILE_END, got: {line}")
+
+        return data
 
     def interactive_mode(self):
         """Run in interactive command mode."""
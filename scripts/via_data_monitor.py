@@ -22,11 +22,37 @@ Usage:
     python3 via_data_monitor.py /dev/ttyACM0
 """
 
+import os
+import queue
+import re
 import serial
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
+# Measurement boundary markers, dispatched on match.lastindex
+MARKERS = re.compile(rb'(Reading full 4106-byte measurement)|(Full 4106 bytes received)')
+MEASUREMENT_START, MEASUREMENT_END = 1, 2
+
+# Characters allowed in a hex line; a hex line translates to b'' with these deleted
+HEX_LINE_CHARS = b'0123456789ABCDEFabcdef '
+
+# Turns a whole TXT hex body into its CSV form in one pass
+SPACE_TO_COMMA = bytes.maketrans(b' ', b',')
+
+# Measurement file framing
+VIA_START = b"===VIA START===\n"
+VIA_STOP = b"===VIA STOP===\n"
+
+# Line batches buffered between the serial reader thread and the file writer
+LINE_QUEUE_SIZE = 1024
+QUEUE_POLL_SECONDS = 0.5  # Wake periodically so Ctrl+C reaches the main thread
+
+# Session log write buffer (bytes) - avoids one write() syscall per line
+LOG_BUFFER_SIZE = 64 * 1024
+
 def create_session_directory():
     """Create timestamped session directory ~/Aeris/data/via/YYYYMMDD.HHMM/"""
     base_dir = Path.home() / "Aeris" / "data" / "via"
@@ -35,16 +61,85 @@ def create_session_directory():
     session_dir.mkdir(parents=True, exist_ok=True)
     return session_dir, session_timestamp
 
+# (minute since epoch, "VIA.YYYYMMDD.HHMM") - reformatted only when the minute rolls over
+_minute_prefix = (None, "")
+
 def generate_measurement_filenames(session_timestamp):
     """Generate measurement filenames with seconds: VIA.YYYYMMDD.HHMM.SS.{csv,txt}"""
-    measurement_timestamp = datetime.now().strftime("%Y%m%d.%H%M.%S")
-    base_name = f"VIA.{measurement_timestamp}"
+    global _minute_prefix
+    now = time.time()
+    minute, second = divmod(int(now), 60)
+    if minute != _minute_prefix[0]:
+        _minute_prefix = (minute, time.strftime("VIA.%Y%m%d.%H%M", time.localtime(now)))
+    base_name = f"{_minute_prefix[1]}.{second:02d}"
     return f"{base_name}.csv", f"{base_name}.txt"
 
 def generate_log_filename(session_timestamp):
     """Generate session log filename: VIA.YYYYMMDD.HHMM.log"""
     return f"VIA.{session_timestamp}.log"
 
+def read_line_batches(ser):
+    """Yield lists of stripped byte lines, one list per serial read
+
+    Blocks until at least one byte arrives, then drains everything the
+    driver has already buffered and splits it with a single bytes.split,
+    so each wakeup hands over a whole batch of lines at once.
+    """
+    pending = b""
+    while True:
+        pending += ser.read(max(1, ser.in_waiting))
+        *lines, pending = pending.split(b'\n')
+        if lines:
+            yield [raw.strip() for raw in lines]
+
+def start_serial_reader(ser, line_queue):
+    """Read serial line batches on a background thread into line_queue
+
+    Keeps the port drained while the main thread is busy writing files.
+    Queuing one batch per read keeps queue locking off the per-line path.
+    None is queued when the reader stops (port closed or error).
+    """
+    def reader():
+        try:
+            for batch in read_line_batches(ser):
+                line_queue.put(batch)
+        except (serial.SerialException, OSError, TypeError):
+            pass  # Port closed underneath us
+        finally:
+            line_queue.put(None)
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    return thread
+
+def queued_lines(line_queue):
+    """Yield lines from the reader thread's batches until it queues None"""
+    while True:
+        try:
+            batch = line_queue.get(timeout=QUEUE_POLL_SECONDS)
+        except queue.Empty:
+            continue
+        if batch is None:
+            return
+        yield from batch
+
+def write_measurement_file(path, body):
+    """Write START + body + STOP to path with a single gathered write"""
+    if not hasattr(os, 'writev'):  # Windows
+        path.write_bytes(VIA_START + body + VIA_STOP)
+        return
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        total = len(VIA_START) + len(body) + len(VIA_STOP)
+        written = os.writev(fd, [VIA_START, body, VIA_STOP])
+        if written < total:  # Short write - finish the remainder, however many writes it takes
+            remainder = memoryview(VIA_START + body + VIA_STOP)[written:]
+            while remainder:
+                remainder = remainder[os.write(fd, remainder):]
+    finally:
+        os.close(fd)
+
 def monitor_serial(port):
     """Monitor serial port and save raw hex byte data + full session log"""
 
@@ -59,79 +154,71 @@ def monitor_serial(port):
     print(f"📊 Saving raw hex byte data (CSV + TXT) + full log")
     print(f"⏳ Waiting for measurements...\n")
 
-    ser = serial.Serial(port, 115200, timeout=1)
+    ser = serial.Serial(port, 115200, timeout=None)  # Block instead of polling
 
     # Open session log file
-    log_file = open(log_file_path, 'w', buffering=1)  # Line buffered
+    # Block buffered; flushed together with each measurement's files
+    log_file = open(log_file_path, 'wb', buffering=LOG_BUFFER_SIZE)
 
     reading_data = False
-    hex_data_txt = []  # Space-separated for TXT
-    hex_data_csv = []  # Comma-separated for CSV
+    hex_body = bytearray()  # Space-separated hex lines for the current measurement
     current_csv_file = None
     current_txt_file = None
     line_count = 0
 
+    # Serial RX runs on its own thread; this loop only validates and writes
+    line_queue = queue.Queue(maxsize=LINE_QUEUE_SIZE)
+    start_serial_reader(ser, line_queue)
+
     try:
-        while True:
-            if ser.in_waiting > 0:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-
-                # Write ALL lines to session log
-                log_file.write(line + '\n')
-
-                # Check for start of hex data (after "Reading full 4106-byte measurement...")
-                if "Reading full 4106-byte measurement" in line:
-                    reading_data = True
-                    hex_data_txt = []
-                    hex_data_csv = []
-                    line_count = 0
-                    csv_name, txt_name = generate_measurement_filenames(session_timestamp)
-                    current_csv_file = session_dir / csv_name
-                    current_txt_file = session_dir / txt_name
-                    print(f"\n📊 Measurement detected:")
-                    print(f"   CSV: {csv_name}")
-                    print(f"   TXT: {txt_name}")
-                    continue
-
-                # Check for end of measurement data
-                if "Full 4106 bytes received" in line and reading_data:
-                    # Save CSV file (comma-separated)
-                    if hex_data_csv and current_csv_file:
-                        with open(current_csv_file, 'w') as f:
-                            f.write("===VIA START===\n")
-                            f.write('\n'.join(hex_data_csv) + '\n')
-                            f.write("===VIA STOP===\n")
-                        print(f"✅ Saved CSV: {current_csv_file.name} ({len(hex_data_csv)} lines)")
-
-                    # Save TXT file (space-separated)
-                    if hex_data_txt and current_txt_file:
-                        with open(current_txt_file, 'w') as f:
-                            f.write("===VIA START===\n")
-                            f.write('\n'.join(hex_data_txt) + '\n')
-                            f.write("===VIA STOP===\n")
-                        print(f"✅ Saved TXT: {current_txt_file.name} ({len(hex_data_txt)} lines)")
-
-                    reading_data = False
-                    hex_data_txt = []
-                    hex_data_csv = []
-                    current_csv_file = None
-                    current_txt_file = None
-                    line_count = 0
-                    continue
-
-                # Capture hex byte lines (lines with hex patterns like "00 01 02 03")
-                if reading_data:
-                    # Check if line contains hex bytes (pattern: XX XX XX where X is hex digit)
-                    if line and all(c in '0123456789ABCDEFabcdef ' for c in line):
-                        # Save TXT format (space-separated, original)
-                        hex_data_txt.append(line)
-                        # Save CSV format (comma-separated)
-                        csv_line = line.replace(' ', ',')
-                        hex_data_csv.append(csv_line)
-                        line_count += 1
+        for line in queued_lines(line_queue):
+            # Write ALL lines to session log
+            log_file.write(line + b'\n')
+
+            match = MARKERS.search(line)
+            marker = match.lastindex if match else None
+
+            # Check for start of hex data (after "Reading full 4106-byte measurement...")
+            if marker == MEASUREMENT_START:
+                reading_data = True
+                hex_body = bytearray()
+                line_count = 0
+                csv_name, txt_name = generate_measurement_filenames(session_timestamp)
+                current_csv_file = session_dir / csv_name
+                current_txt_file = session_dir / txt_name
+                print(f"\n📊 Measurement detected:")
+                print(f"   CSV: {csv_name}")
+                print(f"   TXT: {txt_name}")
+                continue
+
+            # Check for end of measurement data
+            if marker == MEASUREMENT_END and reading_data:
+                if hex_body:
+                    # Save TXT (space-separated, original) and CSV (one translate pass)
+                    write_measurement_file(current_txt_file, hex_body)
+                    write_measurement_file(current_csv_file, hex_body.translate(SPACE_TO_COMMA))
+                    log_file.flush()
+                    print(f"✅ Saved CSV: {current_csv_file.name} ({line_count} lines)")
+                    print(f"✅ Saved TXT: {current_txt_file.name} ({line_count} lines)")
+
+                reading_data = False
+                hex_body = bytearray()
+                current_csv_file = None
+                current_txt_file = None
+                line_count = 0
+                continue
+
+            # Capture hex byte lines (lines with hex patterns like "00 01 02 03")
+            if reading_data:
+                # Check if line contains hex bytes (pattern: XX XX XX where X is hex digit)
+                if line and not line.translate(None, HEX_LINE_CHARS):
+                    hex_body += line + b'\n'
+                    line_count += 1
 
     except KeyboardInterrupt:
         print("\n\n⏹  Monitoring stopped")
+
+    finally:
         log_file.close()
         ser.close()
         print(f"📁 Session saved to: {session_dir}")
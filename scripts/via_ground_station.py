@@ -19,18 +19,56 @@ Directory structure (same as OBC):
 Usage:
     python3 via_ground_station.py /dev/ttyACM0
     python3 via_ground_station.py /dev/ttyACM0 -v    # Verbose mode
+    python3 via_ground_station.py /dev/ttyACM0 -g 10 # Group-commit saves
 
 Controls:
     Ctrl+C to exit
 """
 
+import re
 import serial
 import sys
 import argparse
+import os
+import queue
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
 
+# Radio payload header: "VIA:<size>:" (or a bare "VIA:<size>" line); rejects trailing garbage
+VIA_HEADER = re.compile(rb'VIA:(\d+)(?::|$)')
+
+# Serial read / queue wait timeout (seconds); bounds how long a wait lasts with no data
+READ_TIMEOUT = 0.5
+
+# Most serial reads queued ahead of the main loop before the reader waits
+RX_QUEUE_SIZE = 1024
+
+# Characters per 16-byte row in the joined hex dump ("XX " per byte)
+HEX_ROW_STRIDE = 16 * 3
+
+# Session log write buffer and the longest time data may sit in it unflushed
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 1.0
+
+# Verbose RX dump lines are batched into one stdout write per interval/count
+VERBOSE_FLUSH_INTERVAL = 0.1
+VERBOSE_FLUSH_LINES = 64
+
+# Framing written around every saved hex dump
+VIA_START = b"===VIA START===\n"
+VIA_STOP = b"===VIA STOP===\n"
+
+# Payload size of a full VIA measurement; its RX buffer is allocated once and reused
+VIA_PAYLOAD_SIZE = 4106
+
+# Longest time a queued measurement waits for its group commit (seconds)
+GROUP_COMMIT_INTERVAL = 1.0
+
+# Largest RX buffer allocated up front from a header's size field
+MAX_RX_PREALLOC = 128 * 1024
+
 
 def create_session_directory():
     """Create timestamped session directory"""
@@ -52,6 +90,63 @@ def generate_log_filename(session_timestamp):
     return f"VIA.{session_timestamp}.log"
 
 
+def start_serial_reader(ser, rx_queue):
+    """Read serial data on a background thread into rx_queue
+
+    Keeps the port drained while the main thread is saving files or
+    writing to the terminal. Each read blocks for the first byte, then
+    takes everything already buffered, and is queued as one chunk.
+    None is queued when the reader stops (port closed or error).
+    """
+    def reader():
+        try:
+            while True:
+                data = ser.read(max(1, ser.in_waiting))
+                if data:
+                    rx_queue.put(data)
+        except (serial.SerialException, OSError, TypeError):
+            pass  # Port closed underneath us
+        finally:
+            rx_queue.put(None)
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    return thread
+
+
+def commit_measurements(pending_saves, sync):
+    """Write queued saves, report each once it is on disk, then empty the queue
+
+    pending_saves holds (measurement_number, size, filepath, contents)
+    tuples. With sync, every file is fsync'd before it is closed and the
+    session directory once per group, so a reported save survives power loss.
+    """
+    try:
+        for _, _, filepath, contents in pending_saves:
+            with open(filepath, 'wb') as f:
+                f.write(contents)
+                if sync:
+                    os.fsync(f.fileno())
+
+        if sync and pending_saves and hasattr(os, 'O_DIRECTORY'):  # Not on Windows
+            # Make the new directory entries durable as well
+            dir_fd = os.open(pending_saves[0][2].parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+    except OSError as e:
+        numbers = ", ".join(f"#{number}" for number, _, _, _ in pending_saves)
+        print(f"\n❌ Failed to save measurement {numbers}: {e}")
+    else:
+        for number, size, filepath, _ in pending_saves:
+            print(f"\nMeasurement #{number} saved: {filepath.name}")
+            print(f"  Size: {size} bytes")
+            print(f"  Path: {filepath}")
+
+    pending_saves.clear()
+
+
 def print_progress_bar(current, total, label, width=30):
     """Print a progress bar that updates in place"""
     percent = current / total if total > 0 else 0
@@ -71,13 +166,14 @@ def finish_progress_bar(label, total, actual=None):
     sys.stdout.flush()
 
 
-def ground_station(port, verbose=False, baud=9600):
+def ground_station(port, verbose=False, baud=9600, group_commit=1):
     """Ground station receiver main loop
 
     Args:
         port: Serial port path
         verbose: Show full raw data output
         baud: Baud rate (default 9600 for Artemis receiver)
+        group_commit: Measurements saved and synced together (1 = write each immediately, no sync)
     """
 
     # Create session directory
@@ -99,132 +195,192 @@ def ground_station(port, verbose=False, baud=9600):
     print("Ctrl+C to exit")
     print()
 
-    # Open serial port
-    ser = serial.Serial(port, baud, timeout=0.1)
+    # Open serial port (reads block until data arrives or the timeout expires)
+    ser = serial.Serial(port, baud, timeout=READ_TIMEOUT)
 
-    # Open session log
-    log_file = open(log_file_path, 'w', buffering=1)
+    # Open session log (raw bytes, block-buffered; flushed per measurement and every second)
+    log_file = open(log_file_path, 'wb', buffering=LOG_BUFFER_SIZE)
+    last_log_flush = time.monotonic()
 
     # Reception state
     receiving_data = False
     data_buffer = bytearray()
+    rx_len = 0  # Bytes of data_buffer filled so far
+    measurement_buffer = bytearray(VIA_PAYLOAD_SIZE + 4)  # Reused for every full measurement
     expected_size = 0
     measurement_count = 0
 
     # For accumulating partial messages
-    line_buffer = ""
+    line_buffer = bytearray()
+
+    # Completed measurements waiting for their group commit
+    pending_saves = []
+    first_pending_time = 0.0
+
+    # Pending verbose RX dump lines
+    verbose_buf = []
+    last_verbose_flush = time.monotonic()
+
+    # Serial reads happen on their own thread; the loop below consumes them
+    rx_queue = queue.Queue(maxsize=RX_QUEUE_SIZE)
+    start_serial_reader(ser, rx_queue)
 
     try:
         while True:
-            # Read available data
-            if ser.in_waiting > 0:
-                raw_data = ser.read(ser.in_waiting)
-
+            # Wait for the next chunk; an empty chunk means nothing arrived in time
+            try:
+                raw_data = rx_queue.get(timeout=READ_TIMEOUT)
+            except queue.Empty:
+                raw_data = b""
+            if raw_data is None:
+                print("\nSerial port closed")
+                break
+
+            # Bound how long logged data can sit in the buffer (also runs when idle)
+            now = time.monotonic()
+            if now - last_log_flush >= LOG_FLUSH_INTERVAL:
+                log_file.flush()
+                last_log_flush = now
+
+            if pending_saves and now - first_pending_time >= GROUP_COMMIT_INTERVAL:
+                commit_measurements(pending_saves, sync=True)
+
+            if verbose_buf and (now - last_verbose_flush >= VERBOSE_FLUSH_INTERVAL or
+                                len(verbose_buf) >= VERBOSE_FLUSH_LINES):
+                sys.stdout.write(''.join(verbose_buf))
+                sys.stdout.flush()
+                verbose_buf.clear()
+                last_verbose_flush = now
+
+            if raw_data:
                 # Log raw data
-                try:
-                    text = raw_data.decode('utf-8', errors='ignore')
-                    log_file.write(text)
-                except:
-                    pass
+                log_file.write(raw_data)
 
+            # Bytes of this read not yet consumed; a header or :END can change
+            # mode mid-read, so whatever follows it is handled in the new mode
+            pending = raw_data
+            while pending:
                 # If we're in data reception mode, accumulate binary
                 if receiving_data:
-                    data_buffer.extend(raw_data)
+                    # :END can only appear in the new bytes (or straddle the old tail)
+                    scan_start = max(0, rx_len - 3)
+                    # Fill the pre-sized buffer in place (grows only past expected size)
+                    data_buffer[rx_len:rx_len + len(pending)] = pending
+                    rx_len += len(pending)
 
                     if not verbose:
-                        print_progress_bar(len(data_buffer), expected_size, "Radio RX")
+                        print_progress_bar(rx_len, expected_size, "Radio RX")
                     else:
-                        # Print hex dump
-                        hex_str = ' '.join(f'{b:02X}' for b in raw_data)
-                        print(f"  RX: {hex_str}")
+                        # Queue hex dump (bytes.hex formats in C; no per-byte Python work)
+                        verbose_buf.append(f"  RX: {pending.hex(' ').upper()}\n")
+                    pending = b""
 
-                    # Check for end marker in buffer
-                    if b':END' in data_buffer:
-                        # Extract data before :END
-                        end_idx = data_buffer.find(b':END')
-                        measurement_data = bytes(data_buffer[:end_idx])
+                    # Check for end marker in the unscanned tail
+                    end_idx = data_buffer.find(b':END', scan_start, rx_len)
+                    if end_idx != -1:
+                        # View of the data before :END (no copy; buffer is replaced on reset)
+                        measurement_data = memoryview(data_buffer)[:end_idx]
 
                         if not verbose:
                             finish_progress_bar("Radio RX", expected_size, len(measurement_data))
+                        elif verbose_buf:
+                            sys.stdout.write(''.join(verbose_buf))
+                            verbose_buf.clear()
 
                         # Save measurement
                         measurement_count += 1
                         filename = generate_measurement_filename(session_timestamp)
                         filepath = session_dir / filename
 
-                        with open(filepath, 'wb') as f:
-                            f.write(b"===VIA START===\n")
-                            # Write as hex dump (16 bytes per line)
-                            for i in range(0, len(measurement_data), 16):
-                                chunk = measurement_data[i:i+16]
-                                hex_line = ' '.join(f'{b:02X}' for b in chunk)
-                                f.write(hex_line.encode() + b'\n')
-                            f.write(b"===VIA STOP===\n")
-
-                        print(f"\nMeasurement #{measurement_count} saved: {filename}")
-                        print(f"  Size: {len(measurement_data)} bytes")
-                        print(f"  Path: {filepath}")
+                        # Build the hex dump (16 bytes per line) and write it in one call.
+                        # The payload is hexed once and rows are cut out of it: each
+                        # row is 16 "XX" pairs plus the separator that follows it
+                        hex_str = measurement_data.hex(' ').upper().encode()
+                        out = bytearray(VIA_START)
+                        for i in range(0, len(hex_str), HEX_ROW_STRIDE):
+                            out += hex_str[i:i + HEX_ROW_STRIDE - 1]
+                            out += b'\n'
+                        out += VIA_STOP
+
+                        # Queue the save; it is written once the group is full or old enough
+                        if not pending_saves:
+                            first_pending_time = time.monotonic()
+                        pending_saves.append((measurement_count, len(measurement_data), filepath, out))
+                        if len(pending_saves) >= group_commit:
+                            commit_measurements(pending_saves, sync=group_commit > 1)
+                        log_file.flush()
+                        last_log_flush = time.monotonic()
+
                         print()
                         print("Waiting for next transmission...")
                         print()
 
+                        # Anything after :END goes back to header search
+                        pending = bytes(data_buffer[end_idx + 4:rx_len])
+
                         # Reset state
+                        measurement_data.release()
                         receiving_data = False
                         data_buffer = bytearray()
+                        rx_len = 0
                         expected_size = 0
 
                     continue
 
-                # Not receiving data - look for header
-                try:
-                    text = raw_data.decode('utf-8', errors='ignore')
-                    line_buffer += text
-
-                    # Process complete lines
-                    while '\n' in line_buffer:
-                        line, line_buffer = line_buffer.split('\n', 1)
-                        line = line.strip()
-
-                        if verbose and line:
-                            print(f"RX: {line}")
+                # Not receiving data - look for header (bytes only; decoded just for display)
+                line_buffer += pending
+                pending = b""
+
+                # Process complete lines, consuming them from the front of the buffer
+                nl = line_buffer.find(b'\n')
+                while nl != -1:
+                    line = bytes(line_buffer[:nl]).strip()
+                    del line_buffer[:nl + 1]
+
+                    if verbose and line:
+                        print(f"RX: {line.decode('utf-8', errors='ignore')}")
+
+                    # Check for VIA header ("VIA:4106:")
+                    header = VIA_HEADER.match(line)
+                    if header:
+                        expected_size = int(header.group(1))
+                        receiving_data = True
+                        if expected_size == VIA_PAYLOAD_SIZE:
+                            # Standard measurement: refill the buffer kept for it
+                            data_buffer = measurement_buffer
+                        else:
+                            # Payload plus ":END", capped against a bogus header size
+                            data_buffer = bytearray(min(expected_size + 4, MAX_RX_PREALLOC))
+                        rx_len = 0
 
-                        # Check for VIA header
-                        if line.startswith('VIA:'):
-                            # Parse "VIA:4106:"
-                            parts = line.split(':')
-                            if len(parts) >= 2:
-                                try:
-                                    expected_size = int(parts[1])
-                                    receiving_data = True
-                                    data_buffer = bytearray()
-
-                                    print()
-                                    print("-" * 40)
-                                    print(f"  Receiving VIA measurement")
-                                    print(f"  Expected size: {expected_size} bytes")
-                                    print("-" * 40)
-
-                                except ValueError:
-                                    pass
+                        print()
+                        print("-" * 40)
+                        print(f"  Receiving VIA measurement")
+                        print(f"  Expected size: {expected_size} bytes")
+                        print("-" * 40)
 
-                        # Check for Hello World test
-                        elif 'Hello World' in line:
-                            print(f"Test message received: {line}")
+                        # Bytes after the header line are the start of the payload
+                        pending = bytes(line_buffer)
+                        line_buffer.clear()
+                        break
 
-                        # Show RSSI if present
-                        elif 'RSSI' in line:
-                            print(f"  Signal: {line}")
+                    # Check for Hello World test
+                    elif b'Hello World' in line:
+                        print(f"Test message received: {line.decode('utf-8', errors='ignore')}")
 
-                except:
-                    pass
+                    # Show RSSI if present
+                    elif b'RSSI' in line:
+                        print(f"  Signal: {line.decode('utf-8', errors='ignore')}")
 
-            # Small delay
-            time.sleep(0.01)
+                    nl = line_buffer.find(b'\n')
 
     except KeyboardInterrupt:
         pass
 
     finally:
+        commit_measurements(pending_saves, sync=group_commit > 1)
+        if verbose_buf:
+            sys.stdout.write(''.join(verbose_buf))
         log_file.close()
         ser.close()
         print("\n")
@@ -242,6 +398,7 @@ Examples:
   python3 via_ground_station.py /dev/ttyACM0           # Normal mode
   python3 via_ground_station.py /dev/ttyACM0 -v        # Verbose mode
   python3 via_ground_station.py /dev/ttyACM0 -b 115200 # Different baud
+  python3 via_ground_station.py /dev/ttyACM0 -g 10     # Sync bursts of 10 saves at once
 
 The receiver Teensy should be running radio_receive_test.ino or similar.
         """
@@ -251,6 +408,10 @@ The receiver Teensy should be running radio_receive_test.ino or similar.
                         help="Verbose mode - show full raw data output")
     parser.add_argument("-b", "--baud", type=int, default=9600,
                         help="Baud rate (default: 9600)")
+    parser.add_argument("-g", "--group-commit", type=int, default=1, metavar="N",
+                        help="Save and sync up to N measurements together, at most "
+                             f"{GROUP_COMMIT_INTERVAL:g}s after the first (default: 1, write each immediately)")
 
     args = parser.parse_args()
-    ground_station(args.port, verbose=args.verbose, baud=args.baud)
+    ground_station(args.port, verbose=args.verbose, baud=args.baud,
+                   group_commit=args.group_commit)
@@ -33,16 +33,66 @@ Controls:
 
 import serial
 import sys
-import select
+import selectors
 import termios
 import tty
 import time
 import argparse
+import codecs
+import functools
 import subprocess
 import fcntl
 import os
+import queue
+import re
+import threading
 from datetime import datetime
 from pathlib import Path
+from via_serial import pop_lines
+
+# Longest wait (seconds) for keyboard/serial input before re-checking
+POLL_TIMEOUT = 0.5
+
+# Most keyboard bytes taken per wake; a whole pasted block goes out in one serial write
+STDIN_READ_SIZE = 4096
+
+# Most serial bytes taken per wake; larger than the port's buffer, so one read drains it
+SERIAL_READ_SIZE = 64 * 1024
+
+# Session log write buffer and the longest time data may sit in it unflushed
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 1.0
+
+# Framing written around every saved hex dump
+VIA_START = b"===VIA START===\n"
+VIA_STOP = b"===VIA STOP===\n"
+
+# Minimum time between progress bar repaints that don't change the bar (seconds)
+PROGRESS_REPAINT_INTERVAL = 0.05
+
+# (filled cells, time) of the last repaint, per progress bar label
+_progress_painted = {}
+
+# Console section markers, dispatched on match.lastindex
+MARKERS = re.compile(
+    r'(Starting Measurement)|(Measurement Complete)'
+    r'|(Reading full 4106-byte measurement)|(Full 4106 bytes received)'
+    r'|(CSV DATA OUTPUT:)|(END CSV DATA)'
+    r'|(SD Card)|(?i:(END SD))'
+    r'|(RADIO TRANSMISSION STARTING)|(TX Progress:)|(RADIO TRANSMISSION COMPLETE)'
+    r'|(Radio test message sent|Hello World)|(Radio not available|RFM23 init failed)'
+)
+(MEASUREMENT_START, MEASUREMENT_END, HEX_START, HEX_END, CSV_START, CSV_END,
+ SD_START, SD_END, RADIO_START, RADIO_PROGRESS, RADIO_END, RADIO_TEST, RADIO_ERROR) = range(1, 14)
+
+# First characters of the status lines and separators hidden during a measurement
+MEASUREMENT_NOISE_PREFIXES = frozenset('─🛑📡⚙🔬⏳✅💾')
+
+# A hex dump line: only hex digits and spaces
+HEX_LINE = re.compile(r'[0-9A-Fa-f ]+')
+
+# A numeric data line: digits, commas and minus signs, with at least one digit
+CSV_DATA_LINE = re.compile(r'[,-]*[0-9][0-9,-]*')
 
 
 class SubprocessSerial:
@@ -97,6 +147,20 @@ class SubprocessSerial:
         self._buffer = self._buffer[size:]
         return data
 
+    def read_available(self):
+        """Return buffered bytes plus whatever stdout has ready, without blocking"""
+        data = self._buffer
+        self._buffer = b""
+        try:
+            data += os.read(self.fileno(), SERIAL_READ_SIZE)
+        except BlockingIOError:
+            pass
+        return data
+
+    def fileno(self):
+        """File descriptor of subprocess stdout (for select)"""
+        return self.proc.stdout.fileno()
+
     def reset_input_buffer(self):
         """Clear input buffer"""
         self._buffer = b""
@@ -144,10 +208,50 @@ def generate_log_filename(session_timestamp):
     return f"VIA.{session_timestamp}.log"
 
 
+def start_log_writer(log_file, log_queue):
+    """Write queued session log chunks to log_file on a background thread
+
+    Keeps disk stalls off the serial read path. Data is flushed at most
+    every LOG_FLUSH_INTERVAL; an empty chunk asks for an immediate flush.
+    The file is closed once None is queued and everything before it is
+    written.
+    """
+    def writer():
+        last_flush = time.monotonic()
+        try:
+            while True:
+                try:
+                    data = log_queue.get(timeout=LOG_FLUSH_INTERVAL)
+                except queue.Empty:
+                    data = b''  # Idle: flush whatever is buffered
+                if data is None:
+                    break
+                log_file.write(data)
+                now = time.monotonic()
+                if not data or now - last_flush >= LOG_FLUSH_INTERVAL:
+                    log_file.flush()
+                    last_flush = now
+        finally:
+            log_file.close()
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    return thread
+
+
 def print_progress_bar(current, total, label, width=30):
-    """Print a progress bar that updates in place"""
+    """Print a progress bar that updates in place
+
+    Repaints only when the bar gains a cell or PROGRESS_REPAINT_INTERVAL
+    has passed since the last repaint of the same label.
+    """
     percent = current / total if total > 0 else 0
     filled = int(width * percent)
+    now = time.monotonic()
+    last = _progress_painted.get(label)
+    if last and last[0] == filled and now - last[1] < PROGRESS_REPAINT_INTERVAL:
+        return
+    _progress_painted[label] = (filled, now)
     bar = '█' * filled + '░' * (width - filled)
     # Clear line and print progress (no newline)
     sys.stdout.write(f"\r  {label}: [{bar}] {current}/{total}    ")
@@ -156,6 +260,7 @@ def print_progress_bar(current, total, label, width=30):
 
 def finish_progress_bar(label, total, actual=None):
     """Complete a progress bar with checkmark"""
+    _progress_painted.pop(label, None)
     if actual is None:
         actual = total
     width = 30
@@ -179,24 +284,28 @@ def interactive_console(port, verbose=False, native_bin=None):
     log_filename = generate_log_filename(session_timestamp)
     log_file_path = session_dir / log_filename
 
-    print("═══════════════════════════════════════════════════")
-    print("  VIA Interactive Console")
-    print("═══════════════════════════════════════════════════")
+    # Build the banner and write it to the terminal in one go
+    rule = "═══════════════════════════════════════════════════"
+    banner = [rule, "  VIA Interactive Console", rule]
     if native_bin:
-        print(f"  Mode:         SIMULATION (native binary)")
-        print(f"  Binary:       {native_bin}")
+        banner.append(f"  Mode:         SIMULATION (native binary)")
+        banner.append(f"  Binary:       {native_bin}")
     else:
-        print(f"  Port:         {port}")
-    print(f"  Session dir:  {session_dir}")
-    print(f"  Log file:     {log_filename}")
-    print(f"  Verbose:      {'ON' if verbose else 'OFF'}")
-    print("═══════════════════════════════════════════════════")
-    print()
-    print("Auto-saving: Full log + CSV/TXT per measurement")
-    print("Type commands normally, Ctrl+C to exit")
+        banner.append(f"  Port:         {port}")
+    banner += [
+        f"  Session dir:  {session_dir}",
+        f"  Log file:     {log_filename}",
+        f"  Verbose:      {'ON' if verbose else 'OFF'}",
+        rule,
+        "",
+        "Auto-saving: Full log + CSV/TXT per measurement",
+        "Type commands normally, Ctrl+C to exit",
+    ]
     if not verbose:
-        print("Use -v flag for full raw data output")
-    print()
+        banner.append("Use -v flag for full raw data output")
+    banner.append("")
+    sys.stdout.write("\n".join(banner) + "\n")
+    sys.stdout.flush()
 
     # Open serial port or subprocess
     if native_bin:
@@ -204,14 +313,26 @@ def interactive_console(port, verbose=False, native_bin=None):
     else:
         ser = serial.Serial(port, 115200, timeout=0.1)
 
-    # Open session log
-    log_file = open(log_file_path, 'w', buffering=1)
+    # Open session log (raw bytes, block-buffered; written and flushed by a background thread)
+    log_file = open(log_file_path, 'wb', buffering=LOG_BUFFER_SIZE)
+    log_queue = queue.SimpleQueue()
+    log_writer = start_log_writer(log_file, log_queue)
+
+    # Serial data is read straight from the descriptor the selector watches; the
+    # native wrapper hands back anything it buffered first, so no bytes are stranded
+    if native_bin:
+        read_serial = ser.read_available
+    else:
+        read_serial = functools.partial(os.read, ser.fileno(), SERIAL_READ_SIZE)
 
     # Wait briefly for initial boot message and consume it
     time.sleep(0.5)
-    if ser.in_waiting > 0:
-        boot_data = ser.read(ser.in_waiting).decode('utf-8', errors='ignore')
-        log_file.write(boot_data)
+    try:
+        boot_data = read_serial()
+    except BlockingIOError:
+        boot_data = b''
+    if boot_data:
+        log_queue.put(boot_data)
 
     # Data capture state
     in_measurement = False  # Track if we're in a measurement cycle
@@ -221,9 +342,8 @@ def interactive_console(port, verbose=False, native_bin=None):
     reading_hex = False
     reading_csv = False
     reading_sd = False
-    hex_data_txt = []
-    hex_data_csv = []
-    csv_data = []
+    hex_data_txt = bytearray()  # Captured hex lines, newline-terminated, ready to save
+    csv_data = bytearray()      # Captured Pixel,Intensity rows, likewise
     hex_line_count = 0
     csv_line_count = 0
     sd_line_count = 0
@@ -244,98 +364,127 @@ def interactive_console(port, verbose=False, native_bin=None):
     EXPECTED_CSV_LINES = 2048  # 2048 pixels
     EXPECTED_SD_LINES = 2048   # SD card also outputs 2048 lines
 
+    # One selector wakes the loop for keyboard or serial input
+    selector = selectors.DefaultSelector()
+    selector.register(sys.stdin, selectors.EVENT_READ, 'stdin')
+    selector.register(ser, selectors.EVENT_READ, 'serial')
+
+    # Keyboard bytes are decoded incrementally so a character split across reads survives
+    stdin_decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+
     # Save terminal settings
     old_settings = termios.tcgetattr(sys.stdin)
+    old_line_buffering = sys.stdout.line_buffering
 
     # Line buffer for processing
-    line_buffer = ""
+    line_buffer = bytearray()
 
     try:
         # Set terminal to raw mode for character-by-character input
         tty.setraw(sys.stdin.fileno())
 
+        # Output is flushed explicitly (once per serial read), not on every newline
+        sys.stdout.reconfigure(line_buffering=False)
+
         # Show initial prompt (after raw mode is set)
         sys.stdout.write("VIA> ")
         sys.stdout.flush()
 
         while True:
-            # Check for user keyboard input
-            if select.select([sys.stdin], [], [], 0)[0]:
-                char = sys.stdin.read(1)
-
-                # Ctrl+C to exit
-                if ord(char) == 3:  # Ctrl+C
-                    break
-
-                # Local echo for typed characters
-                if char == '\r':
-                    sys.stdout.write('\n')
-                    # Capture timestamp when sending measure/send command
-                    cmd = command_buffer.strip().lower()
-                    if cmd in ('measure', 'm', 'send'):
-                        measurement_trigger_time = datetime.now()
-                    command_buffer = ""
-                elif char == '\x7f':  # Backspace
-                    sys.stdout.write('\b \b')
-                    command_buffer = command_buffer[:-1] if command_buffer else ""
-                else:
-                    sys.stdout.write(char)
-                    command_buffer += char
+            # Sleep until keyboard or serial input is ready
+            ready = {key.data for key, _ in selector.select(timeout=POLL_TIMEOUT)}
+
+            # Check for user keyboard input (everything typed or pasted since the last wake)
+            if 'stdin' in ready:
+                keys = stdin_decoder.decode(os.read(sys.stdin.fileno(), STDIN_READ_SIZE))
+
+                # Ctrl+C to exit (anything typed after it is dropped)
+                exit_requested = '\x03' in keys
+                keys = keys.split('\x03', 1)[0]
+
+                to_serial = []
+                for char in keys:
+                    # Local echo for typed characters
+                    if char == '\r':
+                        sys.stdout.write('\n')
+                        # Capture timestamp when sending measure/send command
+                        cmd = command_buffer.strip().lower()
+                        if cmd in ('measure', 'm', 'send'):
+                            measurement_trigger_time = datetime.now()
+                        command_buffer = ""
+                    elif char == '\x7f':  # Backspace
+                        sys.stdout.write('\b \b')
+                        command_buffer = command_buffer[:-1] if command_buffer else ""
+                    else:
+                        sys.stdout.write(char)
+                        command_buffer += char
+
+                    # Send to serial port (convert CR to LF for firmware)
+                    to_serial.append('\n' if char == '\r' else char)
                 sys.stdout.flush()
 
-                # Send to serial port (convert CR to LF for firmware)
-                if char == '\r':
-                    ser.write(b'\n')
-                else:
-                    ser.write(char.encode())
-
-            # Check for serial data
-            if ser.in_waiting > 0:
-                data = ser.read(ser.in_waiting)
-                text = data.decode('utf-8', errors='ignore')
+                if to_serial:
+                    ser.write(''.join(to_serial).encode())
+                if exit_requested:
+                    break
 
-                # Always write to log file (full raw data)
-                log_file.write(text)
+            # Check for serial data (one syscall takes everything the port has buffered)
+            data = b''
+            if 'serial' in ready:
+                try:
+                    data = read_serial()
+                    # Readable but empty means the port hung up (or the native binary exited)
+                    port_closed = not data
+                except BlockingIOError:
+                    port_closed = False  # Woken without data after all
+                except OSError:
+                    port_closed = True  # EIO: device unplugged
+                if port_closed:
+                    sys.stdout.write("\r\nSerial port closed\r\n")
+                    sys.stdout.flush()
+                    break
+            if data:
+                # Always log the full raw data (queued; the writer thread does the disk I/O)
+                log_queue.put(data)
 
-                # Add to line buffer for processing
-                line_buffer += text
+                # Add to line buffer for processing (raw bytes; decoded a line at a time)
+                line_buffer += data
 
-                # Process complete lines
-                while '\n' in line_buffer:
-                    line, line_buffer = line_buffer.split('\n', 1)
+                # Process complete lines, consuming them from the front of the buffer
+                for line in pop_lines(line_buffer):
                     line_clean = line.strip()
+                    match = MARKERS.search(line)
+                    marker = match.lastindex if match else None
 
                     # ─────────────────────────────────────────────────────
                     # Section detection and state transitions
                     # ─────────────────────────────────────────────────────
 
                     # Detect measurement start
-                    if "Starting Measurement" in line:
+                    if marker == MEASUREMENT_START:
                         in_measurement = True
                         # Note: timestamp already captured when command was SENT (not here)
                         # Use \r to ensure we start at column 0
                         sys.stdout.write(f"\r\n{line_clean}\n")
-                        sys.stdout.flush()
                         continue
 
                     # Detect measurement end
-                    if "Measurement Complete" in line:
+                    if marker == MEASUREMENT_END:
                         in_measurement = False
                         reading_sd = False
                         measurement_just_ended = True  # Skip the next separator
+                        log_queue.put(b'')  # Flush the log now the measurement is in
                         # Use \r to ensure we start at column 0
                         sys.stdout.write(f"\r{line_clean}\n\n")
-                        sys.stdout.flush()
                         continue
 
                     # Start of hex data section
-                    if "Reading full 4106-byte measurement" in line:
+                    if marker == HEX_START:
                         reading_hex = True
                         reading_csv = False
                         reading_sd = False
-                        hex_data_txt = []
-                        hex_data_csv = []
-                        csv_data = []
+                        hex_data_txt = bytearray()
+                        csv_data = bytearray()
                         hex_line_count = 0
                         # Use trigger time captured at "Starting Measurement" for synchronized timestamps
                         csv_name, txt_name = generate_measurement_filenames(session_timestamp, measurement_trigger_time)
@@ -343,68 +492,57 @@ def interactive_console(port, verbose=False, native_bin=None):
                         current_txt_file = session_dir / txt_name
                         if verbose:
                             sys.stdout.write(f"\r{line_clean}\n")
-                            sys.stdout.flush()
                         continue
 
                     # End of hex data section
-                    if "Full 4106 bytes received" in line and reading_hex:
+                    if marker == HEX_END and reading_hex:
                         if not verbose:
                             finish_progress_bar("Hex data", EXPECTED_HEX_LINES, hex_line_count)
                         reading_hex = False
                         # Save TXT file
                         if hex_data_txt and current_txt_file:
-                            with open(current_txt_file, 'w') as f:
-                                f.write("===VIA START===\n")
-                                f.write('\n'.join(hex_data_txt) + '\n')
-                                f.write("===VIA STOP===\n")
+                            current_txt_file.write_bytes(VIA_START + hex_data_txt + VIA_STOP)
                         if verbose:
                             sys.stdout.write(f"\r{line_clean}\n")
-                            sys.stdout.flush()
                         continue
 
                     # Start of CSV data section
-                    if "CSV DATA OUTPUT:" in line:
+                    if marker == CSV_START:
                         reading_csv = True
                         reading_hex = False
                         csv_line_count = 0
-                        csv_data = []
+                        csv_data = bytearray()
                         if verbose:
                             sys.stdout.write(f"\r{line_clean}\n")
-                            sys.stdout.flush()
                         continue
 
                     # End of CSV data section
-                    if "END CSV DATA" in line and reading_csv:
+                    if marker == CSV_END and reading_csv:
                         if not verbose:
                             finish_progress_bar("CSV data", EXPECTED_CSV_LINES, csv_line_count)
                         reading_csv = False
                         # Save CSV file
                         if csv_data and current_csv_file:
-                            with open(current_csv_file, 'w') as f:
-                                f.write("Pixel,Intensity\n")
-                                f.write('\n'.join(csv_data) + '\n')
+                            current_csv_file.write_bytes(b"Pixel,Intensity\n" + csv_data)
                         if verbose:
                             sys.stdout.write(f"\r{line_clean}\n")
-                            sys.stdout.flush()
                         continue
 
                     # Start of SD card section (if present)
-                    if "SD Card" in line and "DATA" in line.upper():
+                    if marker == SD_START and "DATA" in line.upper():
                         reading_sd = True
                         sd_line_count = 0
                         if sd_enabled and verbose:
                             sys.stdout.write(f"\r{line_clean}\n")
-                            sys.stdout.flush()
                         continue
 
                     # End of SD card section
-                    if reading_sd and "END SD" in line.upper():
+                    if marker == SD_END and reading_sd:
                         if sd_enabled and not verbose:
                             finish_progress_bar("SD card", sd_line_count if sd_line_count > 0 else EXPECTED_SD_LINES)
                         reading_sd = False
                         if verbose:
                             sys.stdout.write(f"\r{line_clean}\n")
-                            sys.stdout.flush()
                         continue
 
                     # ─────────────────────────────────────────────────────
@@ -412,16 +550,15 @@ def interactive_console(port, verbose=False, native_bin=None):
                     # ─────────────────────────────────────────────────────
 
                     # Start of radio transmission
-                    if "RADIO TRANSMISSION STARTING" in line:
+                    if marker == RADIO_START:
                         reading_radio_tx = True
                         radio_bytes_sent = 0
                         radio_bytes_total = EXPECTED_RADIO_BYTES
                         sys.stdout.write(f"\r\n{line_clean}\n")
-                        sys.stdout.flush()
                         continue
 
                     # Radio transmission progress
-                    if reading_radio_tx and "TX Progress:" in line:
+                    if marker == RADIO_PROGRESS and reading_radio_tx:
                         # Parse "TX Progress: 600 / 4106 bytes (14%)"
                         try:
                             parts = line_clean.split()
@@ -436,28 +573,24 @@ def interactive_console(port, verbose=False, native_bin=None):
                             print_progress_bar(radio_bytes_sent, radio_bytes_total, "Radio TX")
                         else:
                             sys.stdout.write(f"\r{line_clean}\n")
-                            sys.stdout.flush()
                         continue
 
                     # End of radio transmission
-                    if "RADIO TRANSMISSION COMPLETE" in line:
+                    if marker == RADIO_END:
                         if not verbose:
                             finish_progress_bar("Radio TX", radio_bytes_total, radio_bytes_sent)
                         reading_radio_tx = False
                         sys.stdout.write(f"\r{line_clean}\n")
-                        sys.stdout.flush()
                         continue
 
                     # Radio test message
-                    if "Radio test message sent" in line or "Hello World" in line:
+                    if marker == RADIO_TEST:
                         sys.stdout.write(f"\r{line_clean}\n")
-                        sys.stdout.flush()
                         continue
 
                     # Radio errors
-                    if "Radio not available" in line or "RFM23 init failed" in line:
+                    if marker == RADIO_ERROR:
                         sys.stdout.write(f"\rERROR: {line_clean}\n")
-                        sys.stdout.flush()
                         continue
 
                     # ─────────────────────────────────────────────────────
@@ -466,14 +599,12 @@ def interactive_console(port, verbose=False, native_bin=None):
 
                     # Process hex data lines
                     if reading_hex and line_clean:
-                        if all(c in '0123456789ABCDEFabcdef ' for c in line_clean):
-                            hex_data_txt.append(line_clean)
-                            csv_line = line_clean.replace(' ', ',')
-                            hex_data_csv.append(csv_line)
+                        if HEX_LINE.fullmatch(line_clean):
+                            hex_data_txt += line_clean.encode()
+                            hex_data_txt += b'\n'
                             hex_line_count += 1
                             if verbose:
                                 sys.stdout.write(f"\r{line_clean}\n")
-                                sys.stdout.flush()
                             else:
                                 print_progress_bar(hex_line_count, EXPECTED_HEX_LINES, "Hex data")
                             continue
@@ -484,27 +615,25 @@ def interactive_console(port, verbose=False, native_bin=None):
                         if line_clean == "Pixel,Intensity":
                             if verbose:
                                 sys.stdout.write(f"\r{line_clean}\n")
-                                sys.stdout.flush()
                             continue
                         # Check if it's a data line (number,number)
-                        if ',' in line_clean and line_clean.replace(',', '').replace('-', '').isdigit():
-                            csv_data.append(line_clean)
+                        if ',' in line_clean and CSV_DATA_LINE.fullmatch(line_clean):
+                            csv_data += line_clean.encode()
+                            csv_data += b'\n'
                             csv_line_count += 1
                             if verbose:
                                 sys.stdout.write(f"\r{line_clean}\n")
-                                sys.stdout.flush()
                             else:
                                 print_progress_bar(csv_line_count, EXPECTED_CSV_LINES, "CSV data")
                             continue
 
                     # Process SD card data lines
                     if reading_sd and line_clean:
-                        if ',' in line_clean and line_clean.replace(',', '').replace('-', '').isdigit():
+                        if ',' in line_clean and CSV_DATA_LINE.fullmatch(line_clean):
                             sd_line_count += 1
                             if sd_enabled:
                                 if verbose:
                                     sys.stdout.write(f"\r{line_clean}\n")
-                                    sys.stdout.flush()
                                 else:
                                     print_progress_bar(sd_line_count, EXPECTED_SD_LINES, "SD card")
                             continue
@@ -529,23 +658,22 @@ def interactive_console(port, verbose=False, native_bin=None):
                     if in_measurement and not verbose:
                         # Skip status lines, separators, and empty lines during measurement
                         # Check for emoji prefixes and separator characters
-                        first_char = line_clean[0] if line_clean else ''
-                        if (line_clean.startswith('─') or
-                            first_char in '🛑📡⚙🔬⏳✅💾' or
-                            line_clean == ''):
+                        if not line_clean or line_clean[0] in MEASUREMENT_NOISE_PREFIXES:
                             continue
 
                     # Use \r to ensure prompt starts at column 0
                     sys.stdout.write(f"\r{line_clean}\n")
-                    sys.stdout.flush()
+
+                # One flush for every line written above (progress bars flush themselves)
+                sys.stdout.flush()
 
                 # Output any remaining partial line (like "VIA> " prompt)
                 if line_buffer and not in_measurement:
                     # Check if it looks like a prompt (ends with > or similar)
-                    if line_buffer.rstrip().endswith('>'):
-                        sys.stdout.write(f"\r{line_buffer}")
+                    if line_buffer.rstrip().endswith(b'>'):
+                        sys.stdout.write(f"\r{line_buffer.decode('utf-8', errors='ignore')}")
                         sys.stdout.flush()
-                        line_buffer = ""
+                        line_buffer.clear()
 
     except KeyboardInterrupt:
         pass
@@ -553,10 +681,12 @@ def interactive_console(port, verbose=False, native_bin=None):
     finally:
         # Restore terminal settings
         termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
-        log_file.close()
+        sys.stdout.reconfigure(line_buffering=old_line_buffering)
+        selector.close()
+        log_queue.put(None)
+        log_writer.join()
         ser.close()
-        print("\n\nSession closed")
-        print(f"Data saved in: {session_dir}")
+        sys.stdout.write(f"\n\nSession closed\nData saved in: {session_dir}\n")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
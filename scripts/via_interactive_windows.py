@@ -27,9 +27,33 @@ import serial
 import serial.tools.list_ports
 import sys
 import msvcrt
+import re
 import threading
+import time
 from datetime import datetime
 from pathlib import Path
+from via_serial import pop_lines
+
+# Session log write buffer and the longest time data may sit in it unflushed
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 1.0
+
+# Framing written around every saved hex dump
+VIA_START = "===VIA START===\n"
+VIA_STOP = "===VIA STOP===\n"
+
+# Measurement boundary markers, dispatched on match.lastindex
+MARKERS = re.compile(r'(Reading full 4106-byte measurement)|(Full 4106 bytes received)')
+HEX_START, HEX_END = 1, 2
+
+# A whitespace-delimited word that is exactly one hex byte ("3F")
+HEX_BYTE_WORD = re.compile(r'(?<!\S)[0-9A-Fa-f]{2}(?!\S)')
+
+# Turns a whole TXT hex body into its CSV form in one pass
+SPACE_TO_COMMA = str.maketrans(' ', ',')
+
+# Idle wait between keyboard polls when no key is pending (seconds)
+KEY_POLL_INTERVAL = 0.01
 
 def create_session_directory():
     """Create timestamped session directory"""
@@ -79,13 +103,12 @@ def interactive_console(port):
             print(f"  - {p.device}: {p.description}")
         sys.exit(1)
 
-    # Open session log
-    log_file = open(log_file_path, 'w', buffering=1)
+    # Open session log (raw bytes, block-buffered; flushed per measurement and every second)
+    log_file = open(log_file_path, 'wb', buffering=LOG_BUFFER_SIZE)
 
     # Data capture state
     reading_data = False
     hex_data_txt = []
-    hex_data_csv = []
     current_csv_file = None
     current_txt_file = None
 
@@ -94,12 +117,16 @@ def interactive_console(port):
 
     def read_serial():
         """Thread to read from serial port"""
-        nonlocal reading_data, hex_data_txt, hex_data_csv, current_csv_file, current_txt_file
+        nonlocal reading_data, hex_data_txt, current_csv_file, current_txt_file
+        last_log_flush = time.monotonic()
+        # Raw bytes of a line still waiting for its newline (may span reads)
+        line_buffer = bytearray()
 
         while running:
             try:
-                if ser.in_waiting > 0:
-                    data = ser.read(ser.in_waiting)
+                # Block (up to the port timeout) for the first byte, then take everything buffered
+                data = ser.read(max(1, ser.in_waiting))
+                if data:
 
                     # Try to decode as UTF-8, but handle binary data intelligently
                     try:
@@ -122,63 +149,56 @@ def interactive_console(port):
                         sys.stdout.write(safe_text)
                         sys.stdout.flush()
 
-                    # Write to log file (preserve original text, handle encoding)
-                    try:
-                        log_file.write(text)
-                        log_file.flush()
-                    except (UnicodeEncodeError, OSError):
-                        # If log fails, write ASCII version
-                        safe_log = text.encode('ascii', errors='replace').decode('ascii')
-                        log_file.write(safe_log)
+                    # Write to log file (exact bytes received; no decode/re-encode)
+                    log_file.write(data)
+                    now = time.monotonic()
+                    if now - last_log_flush >= LOG_FLUSH_INTERVAL:
                         log_file.flush()
+                        last_log_flush = now
 
-                    # Process line-by-line for hex data extraction
-                    for line in text.split('\n'):
+                    # Process complete lines for hex data extraction, consuming them from the buffer
+                    line_buffer += data
+                    for line in pop_lines(line_buffer):
                         line = line.strip()
+                        match = MARKERS.search(line)
+                        marker = match.lastindex if match else None
 
                         # Detect measurement start
-                        if "Reading full 4106-byte measurement" in line:
+                        if marker == HEX_START:
                             reading_data = True
                             hex_data_txt = []
-                            hex_data_csv = []
                             csv_name, txt_name = generate_measurement_filenames(session_timestamp)
                             current_csv_file = session_dir / csv_name
                             current_txt_file = session_dir / txt_name
 
                         # Detect measurement end
-                        elif "Full 4106 bytes received" in line and reading_data:
+                        elif marker == HEX_END and reading_data:
+                            # TXT body is joined once; CSV is the same text with commas
+                            txt_body = '\n'.join(hex_data_txt) + '\n' if hex_data_txt else ''
+
                             # Save CSV
-                            if hex_data_csv and current_csv_file:
+                            if txt_body and current_csv_file:
                                 with open(current_csv_file, 'w') as f:
-                                    f.write("===VIA START===\n")
-                                    f.write('\n'.join(hex_data_csv) + '\n')
-                                    f.write("===VIA STOP===\n")
+                                    f.write(VIA_START + txt_body.translate(SPACE_TO_COMMA) + VIA_STOP)
 
                             # Save TXT
-                            if hex_data_txt and current_txt_file:
+                            if txt_body and current_txt_file:
                                 with open(current_txt_file, 'w') as f:
-                                    f.write("===VIA START===\n")
-                                    f.write('\n'.join(hex_data_txt) + '\n')
-                                    f.write("===VIA STOP===\n")
+                                    f.write(VIA_START + txt_body + VIA_STOP)
 
                             reading_data = False
                             hex_data_txt = []
-                            hex_data_csv = []
+                            log_file.flush()
+                            last_log_flush = time.monotonic()
 
                         # Capture hex lines during measurement
                         elif reading_data and line:
                             # Extract only hex data (ignore chunk progress messages)
-                            hex_parts = []
-                            for word in line.split():
-                                # Check if this word is a hex byte (2 chars, all hex)
-                                if len(word) == 2 and all(c in '0123456789ABCDEFabcdef' for c in word):
-                                    hex_parts.append(word)
+                            hex_parts = HEX_BYTE_WORD.findall(line)
 
                             if hex_parts:
                                 hex_line = ' '.join(hex_parts)
                                 hex_data_txt.append(hex_line)
-                                csv_line = ','.join(hex_parts)
-                                hex_data_csv.append(csv_line)
             except Exception as e:
                 # Log the error but continue
                 if running:
@@ -195,27 +215,34 @@ def interactive_console(port):
     try:
         while True:
             # Check for keyboard input (non-blocking on Windows)
-            if msvcrt.kbhit():
+            if not msvcrt.kbhit():
+                time.sleep(KEY_POLL_INTERVAL)
+                continue
+
+            # Drain every pending keystroke so a burst goes out in one write
+            keys = bytearray()
+            interrupted = False
+            while msvcrt.kbhit():
                 char = msvcrt.getch()
 
                 # Ctrl+C to exit
-                if char == b'\x03':  # Ctrl+C
+                if char == b'\x03':
+                    interrupted = True
                     break
-
-                # Handle Enter key
-                if char == b'\r':
-                    ser.write(b'\r\n')
-                    sys.stdout.write('\n')
+                keys += char
+
+            if keys:
+                # Enter is sent as CRLF
+                ser.write(keys.replace(b'\r', b'\r\n'))
+                # Echo locally (some terminals don't echo in raw mode)
+                try:
+                    sys.stdout.write(keys.decode('utf-8', errors='ignore').replace('\r', '\n'))
                     sys.stdout.flush()
-                else:
-                    # Send to serial port
-                    ser.write(char)
-                    # Echo locally (some terminals don't echo in raw mode)
-                    try:
-                        sys.stdout.write(char.decode('utf-8', errors='ignore'))
-                        sys.stdout.flush()
-                    except:
-                        pass
+                except:
+                    pass
+
+            if interrupted:
+                break
 
     except KeyboardInterrupt:
         pass
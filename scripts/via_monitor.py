@@ -14,11 +14,17 @@ Then in another terminal, connect with screen and use VIA_MEASURE normally:
     screen /dev/ttyACM0 115200
 """
 
+import re
 import serial
 import sys
 import os
 from datetime import datetime
 from pathlib import Path
+from via_serial import read_lines
+
+# CSV section markers, dispatched on match.lastindex
+MARKERS = re.compile(rb'(CSV DATA OUTPUT:)|(END CSV DATA)')
+CSV_START, CSV_END = 1, 2
 
 def ensure_output_directory():
     """Create ~/Aeris/data/via/ directory if it doesn't exist"""
@@ -39,40 +45,40 @@ def monitor_serial(port):
     print(f"🔌 Monitoring serial port: {port}")
     print(f"⏳ Waiting for measurements...\n")
 
-    ser = serial.Serial(port, 115200, timeout=1)
+    ser = serial.Serial(port, 115200, timeout=None)  # Block instead of polling
 
     csv_started = False
     csv_data = []
     current_file = None
 
     try:
-        while True:
-            if ser.in_waiting > 0:
-                line = ser.readline().decode('utf-8', errors='ignore').strip()
-
-                # Check for CSV data markers
-                if "CSV DATA OUTPUT:" in line:
-                    csv_started = True
-                    csv_data = []
-                    current_file = output_dir / generate_filename()
-                    print(f"\n📊 Measurement detected, saving to: {current_file.name}")
-                    continue
-
-                if "END CSV DATA" in line and csv_started:
-                    # Save the captured data
-                    if csv_data and current_file:
-                        with open(current_file, 'w') as f:
-                            f.write('\n'.join(csv_data) + '\n')
-                        print(f"✅ Saved {len(csv_data)} rows to {current_file}")
-
-                    csv_started = False
-                    csv_data = []
-                    current_file = None
-                    continue
-
-                # Capture CSV lines
-                if csv_started and line and ',' in line:
-                    csv_data.append(line)
+        for line in read_lines(ser):
+            match = MARKERS.search(line)
+            marker = match.lastindex if match else None
+
+            # Check for CSV data markers
+            if marker == CSV_START:
+                csv_started = True
+                csv_data = []
+                current_file = output_dir / generate_filename()
+                print(f"\n📊 Measurement detected, saving to: {current_file.name}")
+                continue
+
+            if marker == CSV_END and csv_started:
+                # Save the captured data
+                if csv_data and current_file:
+                    with open(current_file, 'wb') as f:
+                        f.write(b'\n'.join(csv_data) + b'\n')
+                    print(f"✅ Saved {len(csv_data)} rows to {current_file}")
+
+                csv_started = False
+                csv_data = []
+                current_file = None
+                continue
+
+            # Capture CSV lines
+            if csv_started and line and b',' in line:
+                csv_data.append(line)
 
     except KeyboardInterrupt:
         print("\n\n⏹  Monitoring stopped")
@@ -0,0 +1,65 @@
+"""
+Shared serial helpers for the VIA scripts
+
+Line splitting and port waiting used by more than one script in this
+directory. Python puts a script's own directory on sys.path, so the
+scripts here can simply `import via_serial`.
+"""
+
+import io
+import selectors
+
+def open_selector(ser):
+    """Return a selector watching the port for input, or None
+
+    Ports without a real file descriptor (e.g. on Windows) return None
+    and fall back to blocking reads.
+    """
+    try:
+        fd = ser.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+    selector = selectors.DefaultSelector()
+    selector.register(fd, selectors.EVENT_READ)
+    return selector
+
+def read_lines(ser, idle_timeout=None):
+    """Yield lines from the serial port as stripped bytes
+
+    Sleeps in the kernel until the port is readable, then drains everything
+    the driver has already buffered, so lines are split in bulk instead of
+    spinning on in_waiting. Stops after idle_timeout seconds without data
+    (None waits forever).
+    """
+    selector = open_selector(ser)
+    pending = b""
+    while True:
+        if selector is not None and not selector.select(idle_timeout):
+            return
+        chunk = ser.read(max(1, ser.in_waiting))
+        if not chunk:
+            return  # Blocking-read fallback timed out
+        pending += chunk
+        *lines, pending = pending.split(b'\n')
+        for raw in lines:
+            yield raw.strip()
+
+def pop_lines(line_buffer):
+    """Yield each complete line in line_buffer as text, consuming it
+
+    line_buffer is a bytearray of raw serial input; the unterminated tail
+    stays in it for the next read. The firmware's trailing CR is dropped
+    before decoding so most lines need no strip() copy.
+    """
+    while True:
+        nl = line_buffer.find(b'\n')
+        if nl == -1:
+            return
+        end = nl - 1 if nl and line_buffer[nl - 1] == ord('\r') else nl
+        raw_line = line_buffer[:end]
+        del line_buffer[:nl + 1]
+        # Data lines are plain ASCII; only banners need the UTF-8 decoder
+        if raw_line.isascii():
+            yield raw_line.decode('ascii')
+        else:
+            yield raw_line.decode('utf-8', errors='ignore')
@@ -6,8 +6,8 @@ Generates realistic simulated spectrometer data for testing
 without requiring physical hardware.
 """
 
-import random
-import math
+import functools
+import numpy as np
 from pathlib import Path
 
 
@@ -24,7 +24,23 @@ class SpectrometerSimulator:
         """
         self.num_pixels = num_pixels
         self.seed = seed
-        self.rng = random.Random(seed)
+        self.rng = np.random.default_rng(seed)  # Draws whole noise arrays per call
+        self.pixels = np.arange(num_pixels, dtype=np.float64)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _gaussian_kernel(num_pixels, center, width):
+        """Unit-height Gaussian windowed to ±6 sigma (zero elsewhere), computed once per shape (read-only)"""
+        # Beyond 6 sigma the peak is below 2e-8 of its height, far under the noise floor
+        lo = max(0, int(center - 6 * width))
+        hi = min(num_pixels, int(center + 6 * width) + 1)
+
+        kernel = np.zeros(num_pixels)
+        inv_two_w2 = -1.0 / (2.0 * width * width)  # Folds the divide and sign into one scalar
+        offset = np.arange(lo, hi, dtype=np.float64) - center
+        kernel[lo:hi] = np.exp(offset * offset * inv_two_w2)
+        kernel.setflags(write=False)
+        return kernel
 
     def generate_gaussian_peak(self, center=1024, width=100, amplitude=50000):
         """
@@ -36,26 +52,18 @@ class SpectrometerSimulator:
             amplitude: Maximum intensity
 
         Returns:
-            List of intensity values (one per pixel)
+            uint16 ndarray of intensity values (one per pixel)
         """
-        intensities = []
         baseline = 1000  # Background noise level
 
-        for pixel in range(self.num_pixels):
-            # Gaussian peak
-            gaussian = amplitude * math.exp(-((pixel - center) ** 2) / (2 * width ** 2))
+        # Gaussian peak over every pixel at once (shape cached, scaled per call)
+        spectrum = amplitude * self._gaussian_kernel(self.num_pixels, center, width)
 
-            # Add noise
-            noise = self.rng.gauss(0, 50)
+        # Add noise around the baseline, then clamp to valid range, all in place
+        spectrum += self.rng.normal(baseline, 50, self.num_pixels)
+        np.clip(spectrum, 0, 65535, out=spectrum)
 
-            # Combine
-            intensity = int(baseline + gaussian + noise)
-
-            # Clamp to valid range
-            intensity = max(0, min(65535, intensity))
-            intensities.append(intensity)
-
-        return intensities
+        return spectrum.astype(np.uint16)
 
     def generate_multi_peak(self, peaks=None):
         """
@@ -66,7 +74,7 @@ class SpectrometerSimulator:
                    If None, generates 3 random peaks
 
         Returns:
-            List of intensity values
+            uint16 ndarray of intensity values
         """
         if peaks is None:
             peaks = [
@@ -75,19 +83,21 @@ class SpectrometerSimulator:
                 (1536, 90, 45000)
             ]
 
-        intensities = [1000] * self.num_pixels  # Baseline
+        baseline = 1000
+        centers, widths, amplitudes = np.array(peaks, dtype=np.float64).reshape(-1, 3).T
 
-        for center, width, amplitude in peaks:
-            for pixel in range(self.num_pixels):
-                gaussian = amplitude * math.exp(-((pixel - center) ** 2) / (2 * width ** 2))
-                intensities[pixel] += int(gaussian)
+        # Every peak at every pixel in one broadcast (pixels x peaks), summed per pixel
+        # (the one pixels x peaks array is squared, scaled and exp'd in place)
+        gaussians = self.pixels[:, None] - centers
+        gaussians *= gaussians
+        gaussians *= -1.0 / (2.0 * widths * widths)  # Per peak, broadcast across pixels
+        np.exp(gaussians, out=gaussians)
+        spectrum = gaussians @ amplitudes
 
-        # Add noise
-        for i in range(self.num_pixels):
-            noise = self.rng.gauss(0, 50)
-            intensities[i] = max(0, min(65535, int(intensities[i] + noise)))
-
-        return intensities
+        # Add noise around the baseline, then clamp to valid range, all in place
+        spectrum += self.rng.normal(baseline, 50, self.num_pixels)
+        np.clip(spectrum, 0, 65535, out=spectrum)
+        return spectrum.astype(np.uint16)
 
     def generate_flat_spectrum(self, intensity=10000):
         """
@@ -97,25 +107,37 @@ class SpectrometerSimulator:
             intensity: Constant intensity value
 
         Returns:
-            List of intensity values
+            uint16 ndarray of intensity values
+        """
+        spectrum = intensity + self.rng.integers(-100, 100, self.num_pixels, endpoint=True)
+        return np.clip(spectrum, 0, 65535).astype(np.uint16)
+
+    def write_csv(self, intensities, f):
+        """
+        Write intensity data as CSV to an open text stream
+
+        Args:
+            intensities: Intensity values (ndarray or list)
+            f: Writable text file object (file, io.StringIO, ...)
         """
-        return [intensity + self.rng.randint(-100, 100) for _ in range(self.num_pixels)]
+        # Whole body built in memory and written once (plain ints format fastest)
+        values = np.asarray(intensities).tolist()
+        rows = "".join(f"{pixel},{intensity}\n" for pixel, intensity in enumerate(values))
+        f.write("Pixel,Intensity\n" + rows)
 
     def generate_csv(self, intensities, output_path):
         """
         Write intensity data to CSV file
 
         Args:
-            intensities: List of intensity values
+            intensities: Intensity values (ndarray or list)
             output_path: Path to output CSV file
         """
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(output_path, 'w') as f:
-            f.write("Pixel,Intensity\n")
-            for pixel, intensity in enumerate(intensities):
-                f.write(f"{pixel},{intensity}\n")
+            self.write_csv(intensities, f)
 
         print(f"Generated CSV: {output_path}")
 
@@ -124,7 +146,7 @@ class SpectrometerSimulator:
         Generate raw hex output matching Teensy serial format
 
         Args:
-            intensities: List of intensity values
+            intensities: Intensity values (ndarray or list)
 
         Returns:
             String containing hex-formatted data
@@ -133,28 +155,23 @@ class SpectrometerSimulator:
         lines.append("Reading full 4106-byte measurement...")
 
         # Header (10 bytes) - simplified version
-        header = [0x20, 0x00, 0x0A, 0x10, 0x00, 0x00, 0x00, 0x00, 0xFF, 0x00]
+        header = bytes([0x20, 0x00, 0x0A, 0x10, 0x00, 0x00, 0x00, 0x00, 0xFF, 0x00])
 
-        # Convert intensities to bytes (little-endian 16-bit)
-        data_bytes = header.copy()
-        for intensity in intensities:
-            data_bytes.append(intensity & 0xFF)  # LSB
-            data_bytes.append((intensity >> 8) & 0xFF)  # MSB
+        # Convert intensities to bytes (little-endian 16-bit) in one call
+        data_bytes = header + np.asarray(intensities, dtype='<u2').tobytes()
 
-        # Format as hex lines (16 bytes per line)
-        for i in range(0, len(data_bytes), 16):
-            chunk = data_bytes[i:i+16]
-            hex_line = ' '.join(f"{b:02X}" for b in chunk)
-            lines.append(hex_line)
+        # Format as hex lines (16 bytes = 48 chars per line), hexing the buffer once
+        hex_text = data_bytes.hex(' ').upper()
+        lines.extend(hex_text[i:i + 47] for i in range(0, len(hex_text), 48))
 
         lines.append("Full 4106 bytes received")
         return '\n'.join(lines)
 
 
-def generate_test_datasets():
-    """Generate a variety of test datasets"""
+def generate_test_datasets(test_dir=None):
+    """Generate a variety of test datasets (into tests/test_data by default)"""
     sim = SpectrometerSimulator()
-    test_dir = Path(__file__).parent / "test_data"
+    test_dir = Path(test_dir) if test_dir else Path(__file__).parent / "test_data"
     test_dir.mkdir(exist_ok=True)
 
     print("Generating test datasets...")
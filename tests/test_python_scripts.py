@@ -11,15 +11,29 @@ Usage:
 """
 
 import unittest
+import os
 import sys
-import csv
+import io
+import contextlib
+import zlib
+from unittest import mock
 import tempfile
+import numpy as np
 from pathlib import Path
 
 # Add parent directory to path to import scripts
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
-from test_data_generator import SpectrometerSimulator
+from test_data_generator import SpectrometerSimulator, generate_test_datasets
+from extract_measurements import extract_measurements_from_log
+from file_transfer import VIAFileTransfer
+from aggregate_session import aggregate_session
+import capture_measurement
+from via_ground_station import VIA_HEADER, commit_measurements
+from via_serial import pop_lines
+import via_data_monitor
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
 
 
 class TestCSVFormat(unittest.TestCase):
@@ -43,85 +57,86 @@ class TestCSVFormat(unittest.TestCase):
         """CSV file contains exactly 2048 data rows (one per pixel)"""
         sim = SpectrometerSimulator(seed=101)
         intensities = sim.generate_flat_spectrum(intensity=1000)
-        temp_file = Path(tempfile.mktemp(suffix=".csv"))
+        buf = io.StringIO()
 
-        sim.generate_csv(intensities, temp_file)
+        sim.write_csv(intensities, buf)
 
-        with open(temp_file, 'r') as f:
-            lines = f.readlines()
-
-        # Header + 2048 data lines
-        self.assertEqual(len(lines), 2049)
-        temp_file.unlink()
+        # Header + 2048 data lines, each newline-terminated
+        self.assertEqual(buf.getvalue().count('\n'), 2049)
 
     def test_csv_pixel_range_0_to_2047(self):
         """CSV pixels range from 0 to 2047"""
         sim = SpectrometerSimulator(seed=102)
         intensities = sim.generate_flat_spectrum(intensity=1000)
-        temp_file = Path(tempfile.mktemp(suffix=".csv"))
+        buf = io.StringIO()
 
-        sim.generate_csv(intensities, temp_file)
+        sim.write_csv(intensities, buf)
+        buf.seek(0)
 
-        pixels = []
-        with open(temp_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                pixels.append(int(row["Pixel"]))
+        pixels = np.loadtxt(buf, delimiter=",", skiprows=1, dtype=np.int32, usecols=0)
 
         self.assertEqual(pixels[0], 0)
         self.assertEqual(pixels[-1], 2047)
         self.assertEqual(len(pixels), 2048)
-        temp_file.unlink()
 
 
 class TestIntensityRange(unittest.TestCase):
     """Tests for intensity value constraints (16-bit ADC)"""
 
-    def test_intensity_non_negative(self):
-        """All intensity values are >= 0"""
+    def test_negative_noise_clips_to_zero(self):
+        """Noise below zero clips to 0 instead of wrapping to ~65535"""
         sim = SpectrometerSimulator(seed=200)
-        intensities = sim.generate_gaussian_peak()
+        intensities = sim.generate_flat_spectrum(intensity=20)
 
-        for i, val in enumerate(intensities):
-            self.assertGreaterEqual(val, 0, f"Pixel {i} has negative intensity")
+        self.assertEqual(int(intensities.min()), 0)
+        i = int(intensities.argmax())
+        self.assertLessEqual(int(intensities[i]), 120, f"Pixel {i} wrapped to {intensities[i]}")
 
-    def test_intensity_within_16bit(self):
-        """All intensity values fit in 16-bit range (0-65535)"""
+    def test_saturation_clips_to_max(self):
+        """Peaks above 16-bit range saturate at 65535 instead of wrapping"""
         sim = SpectrometerSimulator(seed=201)
-        intensities = sim.generate_gaussian_peak(amplitude=60000)
+        intensities = sim.generate_gaussian_peak(center=1024, width=100, amplitude=80000)
+
+        # Within 10 pixels of center the ideal peak is still above 79000 counts
+        self.assertTrue(np.all(intensities[1014:1035] == 65535))
+
+    def test_no_unexpected_zeros(self):
+        """A normal peak over the 1000-count baseline has no zero pixels"""
+        sim = SpectrometerSimulator(seed=204)
+        intensities = sim.generate_gaussian_peak()
 
-        for i, val in enumerate(intensities):
-            self.assertLessEqual(val, 65535, f"Pixel {i} exceeds 16-bit max")
+        self.assertEqual(np.count_nonzero(intensities), 2048)
+
+    def test_known_seed_values(self):
+        """Spot pixels match the values recorded for a fixed seed"""
+        sim = SpectrometerSimulator(seed=200)
+        intensities = sim.generate_gaussian_peak()
+
+        self.assertEqual(intensities[[0, 1024, 2047]].tolist(), [1015, 51024, 943])
 
     def test_zero_intensity_valid(self):
         """Zero intensity values are handled correctly"""
         sim = SpectrometerSimulator(seed=202)
         intensities = [0] * 2048
-        temp_file = Path(tempfile.mktemp(suffix=".csv"))
+        buf = io.StringIO()
 
-        sim.generate_csv(intensities, temp_file)
+        sim.write_csv(intensities, buf)
+        buf.seek(0)
 
-        with open(temp_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                self.assertEqual(int(row["Intensity"]), 0)
-
-        temp_file.unlink()
+        values = np.loadtxt(buf, delimiter=",", skiprows=1, dtype=np.int32, usecols=1)
+        self.assertTrue(np.all(values == 0))
 
     def test_max_intensity_valid(self):
         """Maximum intensity (65535) is handled correctly"""
         sim = SpectrometerSimulator(seed=203)
         intensities = [65535] * 2048
-        temp_file = Path(tempfile.mktemp(suffix=".csv"))
+        buf = io.StringIO()
 
-        sim.generate_csv(intensities, temp_file)
-
-        with open(temp_file, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                self.assertEqual(int(row["Intensity"]), 65535)
+        sim.write_csv(intensities, buf)
+        buf.seek(0)
 
-        temp_file.unlink()
+        values = np.loadtxt(buf, delimiter=",", skiprows=1, dtype=np.int32, usecols=1)
+        self.assertTrue(np.all(values == 65535))
 
 
 class TestGaussianPeak(unittest.TestCase):
@@ -133,7 +148,7 @@ class TestGaussianPeak(unittest.TestCase):
         center = 1024
         intensities = sim.generate_gaussian_peak(center=center, amplitude=50000)
 
-        max_idx = intensities.index(max(intensities))
+        max_idx = int(intensities.argmax())
 
         self.assertLess(abs(max_idx - center), 10,
                         f"Peak at {max_idx}, expected near {center}")
@@ -144,7 +159,7 @@ class TestGaussianPeak(unittest.TestCase):
         amplitude = 40000
         intensities = sim.generate_gaussian_peak(amplitude=amplitude)
 
-        max_val = max(intensities)
+        max_val = int(intensities.max())
 
         # Allow tolerance for baseline (~1000) and noise (~50)
         self.assertGreater(max_val, amplitude * 0.9)
@@ -157,8 +172,8 @@ class TestGaussianPeak(unittest.TestCase):
         intensities = sim.generate_gaussian_peak(center=center, width=100)
 
         # Compare values equidistant from center
-        left_val = intensities[center - 50]
-        right_val = intensities[center + 50]
+        left_val = int(intensities[center - 50])
+        right_val = int(intensities[center + 50])
 
         # Should be within 30% of each other (noise adds variance)
         diff = abs(left_val - right_val)
@@ -213,7 +228,7 @@ class TestReproducibility(unittest.TestCase):
         data1 = sim1.generate_gaussian_peak()
         data2 = sim2.generate_gaussian_peak()
 
-        self.assertEqual(data1, data2)
+        self.assertTrue(np.array_equal(data1, data2))
 
     def test_same_seed_same_multipeak(self):
         """Identical seeds produce identical multi-peak spectra"""
@@ -223,7 +238,17 @@ class TestReproducibility(unittest.TestCase):
         data1 = sim1.generate_multi_peak()
         data2 = sim2.generate_multi_peak()
 
-        self.assertEqual(data1, data2)
+        self.assertTrue(np.array_equal(data1, data2))
+
+    def test_same_seed_same_flat(self):
+        """Identical seeds produce identical flat spectra"""
+        sim1 = SpectrometerSimulator(seed=504)
+        sim2 = SpectrometerSimulator(seed=504)
+
+        data1 = sim1.generate_flat_spectrum()
+        data2 = sim2.generate_flat_spectrum()
+
+        self.assertTrue(np.array_equal(data1, data2))
 
     def test_different_seeds_different_output(self):
         """Different seeds produce different outputs"""
@@ -233,7 +258,17 @@ class TestReproducibility(unittest.TestCase):
         data1 = sim1.generate_gaussian_peak()
         data2 = sim2.generate_gaussian_peak()
 
-        self.assertNotEqual(data1, data2)
+        self.assertFalse(np.array_equal(data1, data2))
+
+    def test_reference_files_match_generator(self):
+        """Committed test_data files match a fresh generator run"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_test_datasets(tmp)
+            for generated in sorted(Path(tmp).iterdir()):
+                reference = TEST_DATA_DIR / generated.name
+                self.assertEqual(generated.read_bytes(), reference.read_bytes(),
+                                 f"{reference.name} is stale - rerun test_data_generator.py")
 
 
 class TestMultiPeak(unittest.TestCase):
@@ -251,10 +286,295 @@ class TestMultiPeak(unittest.TestCase):
         sim = SpectrometerSimulator(seed=601)
         intensities = sim.generate_multi_peak()
 
-        for i in range(len(intensities) - 1):
-            jump = abs(intensities[i + 1] - intensities[i])
-            self.assertLess(jump, 5000,
-                            f"Discontinuity at pixel {i}: jump of {jump}")
+        # Widen before differencing so uint16 subtraction can't wrap
+        jumps = np.abs(np.diff(intensities.astype(np.int32)))
+        i = int(jumps.argmax())
+        self.assertLess(jumps[i], 5000,
+                        f"Discontinuity at pixel {i}: jump of {jumps[i]}")
+
+
+class TestExtractMeasurements(unittest.TestCase):
+    """Tests for splitting a session log into per-measurement files"""
+
+    def write_log(self, tmp, *bodies):
+        """Write a session log holding one measurement per hex body"""
+        log_path = Path(tmp) / "VIA.20251108.1845.log"
+        log_path.write_text("".join(
+            f"Reading full 4106-byte measurement\n{body}\nFull 4106 bytes received\n"
+            for body in bodies))
+        return log_path
+
+    def test_corrupt_hex_skips_only_bin(self):
+        """A corrupt hex line skips that .bin but keeps its CSV and later measurements"""
+        good = " ".join(["AB"] * 16)
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = self.write_log(tmp, f"{good}\nACE", good)
+            with contextlib.redirect_stdout(io.StringIO()):
+                extract_measurements_from_log(log_path)
+
+            out = Path(tmp)
+            self.assertTrue((out / "VIA.20251108.1845.01.csv").exists())
+            self.assertFalse((out / "VIA.20251108.1845.01.bin").exists())
+            self.assertEqual((out / "VIA.20251108.1845.02.bin").read_bytes(), b"\xab" * 16)
+
+
+class TestAggregateSession(unittest.TestCase):
+    """Tests for per-pixel session statistics"""
+
+    def test_matches_numpy_reference(self):
+        """Streaming mean/min/max over test_data spectra matches a direct NumPy calculation"""
+        sources = sorted(TEST_DATA_DIR.glob("*.csv"))
+        with tempfile.TemporaryDirectory() as tmp:
+            session_dir = Path(tmp) / "20251108.1845"
+            session_dir.mkdir()
+            for i, source in enumerate(sources, 1):
+                (session_dir / f"VIA.20251108.1845.{i:02d}.csv").write_bytes(source.read_bytes())
+            # Hex CSV from extract_measurements.py sits alongside and must be skipped
+            (session_dir / "VIA.20251108.1845.99.csv").write_text(
+                "===VIA START===\n20,00,0A,10\n===VIA STOP===\n")
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                aggregate_session(session_dir)
+            summary = np.loadtxt(session_dir / "VIA.20251108.1845.summary.csv",
+                                 delimiter=",", skiprows=1)
+
+        spectra = np.stack([np.loadtxt(source, delimiter=",", skiprows=1, usecols=1)
+                            for source in sources])
+        self.assertEqual(len(spectra), 5)
+        self.assertTrue(np.array_equal(summary[:, 0], np.arange(spectra.shape[1])))
+        self.assertTrue(np.allclose(summary[:, 1], spectra.mean(axis=0), atol=0.005))
+        self.assertTrue(np.array_equal(summary[:, 2], spectra.min(axis=0)))
+        self.assertTrue(np.array_equal(summary[:, 3], spectra.max(axis=0)))
+
+
+class TestMeasurementFile(unittest.TestCase):
+    """Tests for the data monitor's framed measurement files"""
+
+    def test_repeated_short_writes(self):
+        """Short writev/write calls are retried until the whole file is written"""
+        real_write = os.write
+        body = b"20 00 0A 10\n" * 100
+
+        def short_writev(fd, chunks):
+            return real_write(fd, b"".join(chunks)[:5])
+
+        def short_write(fd, data):
+            return real_write(fd, bytes(data[:7]))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "VIA.20251108.1845.01.txt"
+            with mock.patch.object(via_data_monitor.os, "writev", short_writev), \
+                    mock.patch.object(via_data_monitor.os, "write", short_write):
+                via_data_monitor.write_measurement_file(path, body)
+
+            self.assertEqual(path.read_bytes(),
+                             via_data_monitor.VIA_START + body + via_data_monitor.VIA_STOP)
+
+
+class TestRadioHeader(unittest.TestCase):
+    """Tests for recognising the ground station's radio payload header"""
+
+    def test_header_formats(self):
+        """VIA:<size>: and bare VIA:<size> start a reception; trailing garbage does not"""
+        self.assertEqual(VIA_HEADER.match(b"VIA:4106:").group(1), b"4106")
+        self.assertEqual(VIA_HEADER.match(b"VIA:4106").group(1), b"4106")
+        self.assertIsNone(VIA_HEADER.match(b"VIA:4106abc"))
+        self.assertIsNone(VIA_HEADER.match(b"VIA:"))
+
+
+class TestGroupCommit(unittest.TestCase):
+    """Tests for the ground station's grouped measurement saves"""
+
+    def commit(self, pending_saves):
+        """Run a synced group commit; returns what it printed"""
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            commit_measurements(pending_saves, sync=True)
+        self.assertEqual(pending_saves, [])
+        return out.getvalue()
+
+    def test_group_written_and_reported(self):
+        """Every file in a synced group is written, then reported saved"""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [Path(tmp) / f"VIA.20251108.1845.0{i}.txt" for i in (1, 2)]
+            output = self.commit([(1, 3, paths[0], b"one"), (2, 3, paths[1], b"two")])
+
+            self.assertEqual([path.read_bytes() for path in paths], [b"one", b"two"])
+        self.assertIn("Measurement #1 saved", output)
+        self.assertIn("Measurement #2 saved", output)
+
+    def test_failed_write_not_reported_saved(self):
+        """A save that fails is reported as a failure, never as saved"""
+        with tempfile.TemporaryDirectory() as tmp:
+            missing = Path(tmp) / "no_such_dir" / "VIA.20251108.1845.01.txt"
+            output = self.commit([(1, 3, missing, b"one")])
+
+        self.assertNotIn("saved", output)
+        self.assertIn("Failed to save measurement #1", output)
+
+
+class FakeSerial:
+    """In-memory stand-in for serial.Serial that replays canned device output
+
+    Each chunk becomes readable only after the previous one is consumed,
+    like bytes arriving over the wire; an empty read means timeout.
+    """
+
+    def __init__(self, *chunks):
+        self.chunks = [bytearray(chunk) for chunk in chunks if chunk]
+        self.written = bytearray()
+        self.timeout = 1.0
+        self.is_open = True
+
+    @property
+    def in_waiting(self):
+        return len(self.chunks[0]) if self.chunks else 0
+
+    def read(self, size=1):
+        if not self.chunks:
+            return b""
+        chunk = self.chunks[0]
+        data = bytes(chunk[:size])
+        del chunk[:size]
+        if not chunk:
+            self.chunks.pop(0)
+        return data
+
+    def readinto(self, buf):
+        data = self.read(len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+    def readline(self):
+        line = bytearray()
+        while not line.endswith(b"\n"):
+            byte = self.read(1)
+            if not byte:
+                break
+            line += byte
+        return bytes(line)
+
+    def write(self, data):
+        self.written += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+class TestPopLines(unittest.TestCase):
+    """Tests for splitting buffered serial input into lines"""
+
+    def test_lines_split_across_reads(self):
+        """CR is dropped, UTF-8 decodes, and an unterminated tail waits for the next read"""
+        line_buffer = bytearray(b"20 00 0A\r\n\xe2\x9c\x85 Full 4106 by")
+        self.assertEqual(list(pop_lines(line_buffer)), ["20 00 0A"])
+        self.assertEqual(line_buffer, bytearray("✅ Full 4106 by".encode()))
+
+        line_buffer += b"tes received.\r\n"
+        self.assertEqual(list(pop_lines(line_buffer)), ["✅ Full 4106 bytes received."])
+        self.assertEqual(line_buffer, bytearray())
+
+
+class TestCaptureMeasurement(unittest.TestCase):
+    """Tests for capturing one measurement's CSV section to a file"""
+
+    CSV_SECTION = b"CSV DATA OUTPUT:\r\nPixel,Intensity\r\n0,1000\r\n1,1001\r\n"
+
+    def capture(self, *chunks):
+        """Run capture_measurement against canned output; returns the temp dir contents"""
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "spectrum.csv"
+            with mock.patch.object(capture_measurement.serial, "Serial",
+                                   return_value=FakeSerial(*chunks)), \
+                    mock.patch.object(capture_measurement.time, "sleep"), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                capture_measurement.capture_measurement("fake", str(output))
+            return {path.name: path.read_bytes() for path in Path(tmp).iterdir()}
+
+    def test_complete_capture_saved(self):
+        """CSV rows are saved once END CSV DATA arrives"""
+        files = self.capture(self.CSV_SECTION, b"END CSV DATA\r\n")
+
+        self.assertEqual(files, {"spectrum.csv": b"Pixel,Intensity\n0,1000\n1,1001\n"})
+
+    def test_incomplete_capture_leaves_no_file(self):
+        """Output that stops before END CSV DATA leaves no partial file behind"""
+        files = self.capture(self.CSV_SECTION)
+
+        self.assertEqual(files, {})
+
+
+class TestFileTransfer(unittest.TestCase):
+    """Tests for the SD card file transfer client"""
+
+    def client(self, *chunks):
+        """Transfer client wired to a fake serial port"""
+        client = VIAFileTransfer("fake")
+        client.ser = FakeSerial(*chunks)
+        return client
+
+    # Raw payload with line endings and hex-looking bytes, so framing bugs show
+    PAYLOAD = bytes(range(256)) + b"\r\nFILE_END\r\n" + b"\x00" * 100
+
+    def binary_reply(self, payload, crc):
+        """A GET_FILE_BIN response framed as OBCBridge::transferFileBinary sends it"""
+        return [b"FILE_BIN_START\r\n", b"spectrum.bin\r\n", f"{len(payload)}\r\n".encode(),
+                payload + crc.to_bytes(4, "little"), b"\r\nFILE_END\r\n"]
+
+    def download(self, client):
+        """Download spectrum.bin into a temp dir; returns the saved bytes or None"""
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "spectrum.bin"
+            with contextlib.redirect_stdout(io.StringIO()):
+                client.download_file("spectrum.bin", str(out))
+            return out.read_bytes() if out.exists() else None
+
+    def test_binary_transfer(self):
+        """GET_FILE_BIN saves the raw payload when its CRC-32 matches"""
+        client = self.client(*self.binary_reply(self.PAYLOAD, zlib.crc32(self.PAYLOAD)))
+
+        self.assertEqual(self.download(client), self.PAYLOAD)
+        self.assertEqual(bytes(client.ser.written), b"GET_FILE_BIN spectrum.bin\n")
+
+    def test_binary_crc_mismatch(self):
+        """A CRC-32 mismatch discards the transfer instead of saving it"""
+        client = self.client(*self.binary_reply(self.PAYLOAD, zlib.crc32(self.PAYLOAD) ^ 1))
+
+        self.assertIsNone(self.download(client))
+
+    def test_legacy_hex_fallback(self):
+        """Legacy firmware rejecting GET_FILE_BIN falls back to hex GET_FILE"""
+        client = self.client(b"ERROR: Unknown command\r\n",
+                             b"FILE_START\r\n", b"spectrum.bin\r\n",
+                             f"{len(self.PAYLOAD)}\r\n".encode(),
+                             self.PAYLOAD.hex().upper().encode(), b"\r\nFILE_END\r\n")
+
+        self.assertEqual(self.download(client), self.PAYLOAD)
+        self.assertEqual(bytes(client.ser.written),
+                         b"GET_FILE_BIN spectrum.bin\nGET_FILE spectrum.bin\n")
+
+    def test_large_listing_not_truncated(self):
+        """A file listing over 64 KiB arrives whole, read in chunks"""
+        listing = "".join(f"spectrum_{i:05d}.csv,12345\r\n" for i in range(4000)).encode()
+        chunks = [listing[i:i + 1000] for i in range(0, len(listing), 1000)]
+        client = self.client(*chunks, b"LIST_END\r\n")
+
+        payload = client.read_until(b"LIST_END")
+        self.assertEqual(payload, listing + b"LIST_END")
+
+    def test_missing_list_end_raises(self):
+        """A listing that never sends LIST_END raises instead of returning partial data"""
+        client = self.client(b"spectrum_00001.csv,12345\r\n")
+
+        with self.assertRaises(TimeoutError):
+            client.read_until(b"LIST_END")
 
 
 class CompactTestResult(unittest.TextTestResult):
@@ -295,21 +615,24 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestHexFormat))
     suite.addTests(loader.loadTestsFromTestCase(TestReproducibility))
     suite.addTests(loader.loadTestsFromTestCase(TestMultiPeak))
+    suite.addTests(loader.loadTestsFromTestCase(TestExtractMeasurements))
+    suite.addTests(loader.loadTestsFromTestCase(TestAggregateSession))
+    suite.addTests(loader.loadTestsFromTestCase(TestPopLines))
+    suite.addTests(loader.loadTestsFromTestCase(TestCaptureMeasurement))
+    suite.addTests(loader.loadTestsFromTestCase(TestMeasurementFile))
+    suite.addTests(loader.loadTestsFromTestCase(TestRadioHeader))
+    suite.addTests(loader.loadTestsFromTestCase(TestGroupCommit))
+    suite.addTests(loader.loadTestsFromTestCase(TestFileTransfer))
 
     if verbose:
         runner = unittest.TextTestRunner(verbosity=2)
         result = runner.run(suite)
     else:
         # Quiet mode - collect results silently, then print compact summary
-        import io
-        import contextlib
-
-        # Suppress all stdout during test run (e.g., "Generated CSV" messages)
-        with contextlib.redirect_stdout(io.StringIO()):
-            stream = open('/dev/null', 'w')
-            runner = unittest.TextTestRunner(stream=stream, verbosity=0, resultclass=CompactTestResult)
+        # Discard all stdout during test run (e.g., "Generated CSV" messages)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            runner = unittest.TextTestRunner(stream=devnull, verbosity=0, resultclass=CompactTestResult)
             result = runner.run(suite)
-            stream.close()
 
         result.printResults()
 
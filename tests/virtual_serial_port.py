@@ -6,96 +6,66 @@ Creates a pair of virtual serial ports for testing VIA scripts
 without physical hardware.
 
 Usage:
-    # Terminal 1: Run the simulator (acts as Teensy)
-    python3 virtual_serial_port.py
+    # Terminal 1: Run the simulator (acts as Teensy; -v logs every command)
+    python3 virtual_serial_port.py [-v]
 
     # Terminal 2: Run your test script
     python3 ../scripts/via_interactive.py /tmp/ttyVIA0
 """
 
 import os
+import logging
 import pty
 import time
 import select
 import sys
 import termios
 import tty
+import numpy as np
 from pathlib import Path
 from test_data_generator import SpectrometerSimulator
 
+# Per-command traffic log (debug level, enabled with -v)
+logger = logging.getLogger('via.simulator')
 
-class VirtualTeensy:
-    """Simulates Teensy 4.1 running VIA firmware"""
+# Boot banner and prompt, encoded once
+BOOT_MESSAGE = """
+════════════════════════════════════════════════════════
+  AERIS VIA Spectrometer Control System (SIMULATED)
+  Version 3.0 - Command Console Mode
+════════════════════════════════════════════════════════
 
-    # Output formatting constants
-    SEPARATOR = "──────────────────────────────────────────────"
-    HEADER = "════════════════════════════════════════════════════════"
+Initializing SD Card...
+⚠️ SD Card not found - logging disabled
 
-    def __init__(self):
-        self.sim = SpectrometerSimulator()
-        self.measurement_count = 0
-        self.auto_mode = False
-        self.auto_interval = 100
-        self.sd_enabled = False  # Simulated SD card (disabled by default)
+Initializing USB Host...
+✅ USB Host controller initialized
+   Waiting for AvaSpec spectrometer...
 
-    def handle_command(self, command):
-        """Process incoming command and return response"""
-        cmd = command.strip().lower()
+✅ AvaSpec Mini device found and claimed. (Simulated)
 
-        if cmd in ['help', '?']:
-            return self.get_help_text()
+════════════════════════════════════════════════════════
+System Ready!
+════════════════════════════════════════════════════════
 
-        elif cmd == 'measure' or cmd == 'm':
-            return self.perform_measurement()
+Type 'help' for available commands
 
-        elif cmd == 'identify' or cmd == 'id':
-            return self.get_identification()
+VIA> """.encode()
+PROMPT = b"VIA> "
 
-        elif cmd == 'status':
-            return self.get_status()
+# Pty read size for the non-blocking drain (one read normally empties the pty)
+READ_SIZE = 64 * 1024
 
-        elif cmd.startswith('auto'):
-            parts = cmd.split()
-            if len(parts) > 1:
-                try:
-                    self.auto_interval = int(parts[1])
-                except ValueError:
-                    pass
-            self.auto_mode = True
-            return (f"\n🔄 Auto-measurement mode STARTED\n"
-                   f"   Interval: {self.auto_interval} seconds\n"
-                   f"   Type 'stop' to end auto mode\n")
-
-        elif cmd == 'stop':
-            if self.auto_mode:
-                self.auto_mode = False
-                return "\n⏹  Auto-measurement mode STOPPED\n"
-            else:
-                return "⚠️ Auto mode is not running\n"
-
-        elif cmd == 'sd-on':
-            if not self.sd_enabled:
-                self.sd_enabled = True
-                return "💾 Enabling SD card logging...\n"
-            else:
-                return "⚠️ SD card logging already enabled\n"
-
-        elif cmd == 'sd-off':
-            if self.sd_enabled:
-                self.sd_enabled = False
-                return "💾 Disabling SD card logging...\n"
-            else:
-                return "⚠️ SD card logging already disabled\n"
-
-        elif cmd:
-            return (f"❌ Unknown command: '{cmd}'\n"
-                   f"   Type 'help' for available commands\n")
 
-        return ""
+class VirtualTeensy:
+    """Simulates Teensy 4.1 running VIA firmware"""
+
+    # Output formatting constants
+    SEPARATOR = "──────────────────────────────────────────────"
+    HEADER = "════════════════════════════════════════════════════════"
 
-    def get_help_text(self):
-        """Return help text"""
-        return """
+    # Constant responses, rendered and encoded once
+    HELP_TEXT = """
 ════════════════════════════════════════════════════════
   AVANTES SPECTROMETER COMMAND CONSOLE (SIMULATED)
 ════════════════════════════════════════════════════════
@@ -117,10 +87,7 @@ Examples:
 
 ════════════════════════════════════════════════════════
 """
-
-    def get_identification(self):
-        """Return simulated device identification"""
-        return """
+    IDENTIFICATION = """
 📡 Querying device identification...
 
 Response: get_ident
@@ -129,6 +96,114 @@ Response: get_ident
 ...
 ✅ Device: AvaSpec-Mini2048CL (Simulated)
 """
+    HELP_BYTES = HELP_TEXT.encode()
+    IDENTIFICATION_BYTES = IDENTIFICATION.encode()
+    AUTO_STOPPED = "\n⏹  Auto-measurement mode STOPPED\n".encode()
+    AUTO_NOT_RUNNING = "⚠️ Auto mode is not running\n".encode()
+    SD_ENABLING = "💾 Enabling SD card logging...\n".encode()
+    SD_ALREADY_ENABLED = "⚠️ SD card logging already enabled\n".encode()
+    SD_DISABLING = "💾 Disabling SD card logging...\n".encode()
+    SD_ALREADY_DISABLED = "⚠️ SD card logging already disabled\n".encode()
+
+    # Fixed sections of the measurement output, encoded once
+    MEASUREMENT_PREAMBLE = "".join(f"{line}\n" for line in [
+        HEADER,
+        "🛑 Ensuring device is stopped...",
+        "📡 Querying device identification...",
+        "⚙️  Preparing measurement parameters...",
+        "🔬 Starting measurement...",
+        "⏳ Acquiring data...",
+        "",
+        "📡 Reading full 4106-byte measurement...",
+    ]).encode()
+    CSV_PREAMBLE = "".join(f"{line}\n" for line in [
+        "✅ Full 4106 bytes received.",
+        "",
+        SEPARATOR,
+        "CSV DATA OUTPUT:",
+        SEPARATOR,
+        "Pixel,Intensity",
+    ]).encode()
+    CSV_END = f"{SEPARATOR}\nEND CSV DATA\n{SEPARATOR}\n".encode()
+    SD_PREAMBLE = f"\n{SEPARATOR}\nSD Card DATA OUTPUT:\n{SEPARATOR}\nPixel,Intensity\n".encode()
+    SD_END = f"{SEPARATOR}\nEND SD Card DATA\n{SEPARATOR}\n".encode()
+    MEASUREMENT_END = f"{HEADER}\nMeasurement Complete!\n{HEADER}\n".encode()
+
+    def __init__(self):
+        self.sim = SpectrometerSimulator()
+        self.measurement_count = 0
+        self.auto_mode = False
+        self.auto_interval = 100
+        self.next_auto_time = 0.0  # time.monotonic() deadline of the next auto measurement
+        self.sd_enabled = False  # Simulated SD card (disabled by default)
+
+        # Fixed-word commands, one dict lookup each ('auto N' takes an argument)
+        self.commands = {
+            'help': lambda: self.HELP_BYTES,
+            '?': lambda: self.HELP_BYTES,
+            'measure': self.perform_measurement,
+            'm': self.perform_measurement,
+            'identify': lambda: self.IDENTIFICATION_BYTES,
+            'id': lambda: self.IDENTIFICATION_BYTES,
+            'status': lambda: self.get_status().encode(),
+            'stop': self.stop_auto,
+            'sd-on': self.sd_on,
+            'sd-off': self.sd_off,
+        }
+
+    def handle_command(self, command):
+        """Process incoming command and return the response as bytes"""
+        cmd = command.strip().lower()
+
+        handler = self.commands.get(cmd)
+        if handler:
+            return handler()
+
+        if cmd.startswith('auto'):
+            return self.start_auto(cmd)
+
+        if cmd:
+            return (f"❌ Unknown command: '{cmd}'\n"
+                   f"   Type 'help' for available commands\n").encode()
+
+        return b""
+
+    def start_auto(self, cmd):
+        """Start auto-measurement mode, taking the interval from 'auto N' if given"""
+        parts = cmd.split()
+        if len(parts) > 1:
+            try:
+                seconds = int(parts[1])
+                if seconds > 0:  # Firmware ignores non-positive intervals
+                    self.auto_interval = seconds
+            except ValueError:
+                pass
+        self.auto_mode = True
+        self.next_auto_time = time.monotonic() + self.auto_interval
+        return (f"\n🔄 Auto-measurement mode STARTED\n"
+               f"   Interval: {self.auto_interval} seconds\n"
+               f"   Type 'stop' to end auto mode\n").encode()
+
+    def stop_auto(self):
+        """Stop auto-measurement mode"""
+        if self.auto_mode:
+            self.auto_mode = False
+            return self.AUTO_STOPPED
+        return self.AUTO_NOT_RUNNING
+
+    def sd_on(self):
+        """Enable simulated SD card logging"""
+        if not self.sd_enabled:
+            self.sd_enabled = True
+            return self.SD_ENABLING
+        return self.SD_ALREADY_ENABLED
+
+    def sd_off(self):
+        """Disable simulated SD card logging"""
+        if self.sd_enabled:
+            self.sd_enabled = False
+            return self.SD_DISABLING
+        return self.SD_ALREADY_DISABLED
 
     def get_status(self):
         """Return system status"""
@@ -143,21 +218,24 @@ System Status:
 {self.SEPARATOR}
 """
 
+    def auto_seconds_remaining(self):
+        """Seconds until the next auto measurement is due (None if auto mode is off)"""
+        if not self.auto_mode:
+            return None
+        return max(0.0, self.next_auto_time - time.monotonic())
+
+    def auto_measurement(self):
+        """Take the due auto measurement and schedule the next; returns bytes"""
+        self.next_auto_time = time.monotonic() + self.auto_interval
+        return (self.perform_measurement() +
+                f"Next measurement in {self.auto_interval} seconds (type 'stop' to end)\n\n".encode())
+
     def perform_measurement(self):
-        """Simulate a full measurement cycle"""
+        """Simulate a full measurement cycle; returns the console output as bytes"""
         self.measurement_count += 1
 
-        output = []
-        output.append(f"\n{self.HEADER}")
-        output.append(f"Starting Measurement #{self.measurement_count}")
-        output.append(self.HEADER)
-        output.append("🛑 Ensuring device is stopped...")
-        output.append("📡 Querying device identification...")
-        output.append("⚙️  Preparing measurement parameters...")
-        output.append("🔬 Starting measurement...")
-        output.append("⏳ Acquiring data...")
-        output.append("")
-        output.append("📡 Reading full 4106-byte measurement...")
+        out = bytearray(f"\n{self.HEADER}\nStarting Measurement #{self.measurement_count}\n".encode())
+        out += self.MEASUREMENT_PREAMBLE
 
         # Generate realistic spectrum data
         intensities = self.sim.generate_gaussian_peak(
@@ -168,55 +246,50 @@ System Status:
 
         # Output hex data (header + intensity data)
         # Header (10 bytes)
-        header = [0x20, 0x00, 0x0A, 0x10, 0x00, 0x00, 0x00, 0x00, 0xFF, 0x00]
-
-        # Convert to bytes
-        data_bytes = header.copy()
-        for intensity in intensities:
-            data_bytes.append(intensity & 0xFF)
-            data_bytes.append((intensity >> 8) & 0xFF)
-
-        # Output hex dump (16 bytes per line)
-        for i in range(0, len(data_bytes), 16):
-            chunk = data_bytes[i:i+16]
-            hex_line = ' '.join(f"{b:02X}" for b in chunk)
-            output.append(hex_line)
-
-        output.append("✅ Full 4106 bytes received.")
-        output.append("")
-        output.append(self.SEPARATOR)
-        output.append("CSV DATA OUTPUT:")
-        output.append(self.SEPARATOR)
-        output.append("Pixel,Intensity")
-
-        # Output CSV data
-        for pixel, intensity in enumerate(intensities):
-            output.append(f"{pixel},{intensity}")
-
-        output.append(self.SEPARATOR)
-        output.append("END CSV DATA")
-        output.append(self.SEPARATOR)
+        header = bytes([0x20, 0x00, 0x0A, 0x10, 0x00, 0x00, 0x00, 0x00, 0xFF, 0x00])
+
+        # Convert to bytes (little-endian 16-bit, packed in one call)
+        data_bytes = header + np.asarray(intensities, dtype='<u2').tobytes()
+
+        # Output hex dump (16 bytes = 48 chars per line): hex the buffer once,
+        # then turn every 48th separator into a newline in place
+        hex_dump = bytearray(data_bytes.hex(' ').upper().encode('ascii'))
+        hex_dump[47::48] = b'\n' * len(range(47, len(hex_dump), 48))
+        out += hex_dump
+        out += b'\n'
+
+        # Output CSV data (rows joined once from plain ints; reused by the SD section)
+        csv_rows = ''.join(f"{pixel},{intensity}\n" for pixel, intensity in enumerate(intensities.tolist())).encode()
+        out += self.CSV_PREAMBLE
+        out += csv_rows
+        out += self.CSV_END
 
         # SD card output section (if enabled)
         if self.sd_enabled:
-            output.append("")
-            output.append(self.SEPARATOR)
-            output.append("SD Card DATA OUTPUT:")
-            output.append(self.SEPARATOR)
-            output.append("Pixel,Intensity")
-            for pixel, intensity in enumerate(intensities):
-                output.append(f"{pixel},{intensity}")
-            output.append(self.SEPARATOR)
-            output.append("END SD Card DATA")
-            output.append(self.SEPARATOR)
-            output.append(f"✅ /spectrum_{self.measurement_count:04d}.csv successfully written to SD card.")
-
-        output.append(self.HEADER)
-        output.append("Measurement Complete!")
-        output.append(self.HEADER)
-        output.append("")
-
-        return '\n'.join(output)
+            out += self.SD_PREAMBLE
+            out += csv_rows
+            out += self.SD_END
+            out += f"✅ /spectrum_{self.measurement_count:04d}.csv successfully written to SD card.\n".encode()
+
+        out += self.MEASUREMENT_END
+        return bytes(out)
+
+
+def write_pty(fd, chunks):
+    """Write chunks to the non-blocking pty with one gathered write, waiting while it is full"""
+    total = sum(len(chunk) for chunk in chunks)
+    try:
+        written = os.writev(fd, chunks)
+    except BlockingIOError:
+        written = 0
+    if written < total:  # Short write - finish the remainder as the client drains the pty
+        remainder = memoryview(b"".join(chunks))[written:]
+        while remainder:
+            select.select([], [fd], [])
+            try:
+                remainder = remainder[os.write(fd, remainder):]
+            except BlockingIOError:
+                pass
 
 
 def run_virtual_serial():
@@ -231,6 +304,7 @@ def run_virtual_serial():
     # Create pseudo-terminal pair
     master, slave = pty.openpty()
     slave_name = os.ttyname(slave)
+    os.set_blocking(master, False)  # Reads drain until empty instead of blocking
 
     # Disable echo on the slave side to prevent feedback loop
     attrs = termios.tcgetattr(slave)
@@ -256,70 +330,55 @@ def run_virtual_serial():
     teensy = VirtualTeensy()
 
     # Send boot message
-    boot_msg = """
-════════════════════════════════════════════════════════
-  AERIS VIA Spectrometer Control System (SIMULATED)
-  Version 3.0 - Command Console Mode
-════════════════════════════════════════════════════════
-
-Initializing SD Card...
-⚠️ SD Card not found - logging disabled
-
-Initializing USB Host...
-✅ USB Host controller initialized
-   Waiting for AvaSpec spectrometer...
-
-✅ AvaSpec Mini device found and claimed. (Simulated)
-
-════════════════════════════════════════════════════════
-System Ready!
-════════════════════════════════════════════════════════
-
-Type 'help' for available commands
-
-VIA> """
-
-    os.write(master, boot_msg.encode())
+    write_pty(master, [BOOT_MESSAGE])
 
     try:
-        buffer = ""
+        buffer = b""
         while True:
-            # Check for incoming data
-            ready, _, _ = select.select([master], [], [], 0.1)
+            # Sleep in the kernel until the client sends something or an auto measurement is due
+            ready, _, _ = select.select([master], [], [], teensy.auto_seconds_remaining())
+
+            if teensy.auto_seconds_remaining() == 0.0:
+                response = teensy.auto_measurement()
+                write_pty(master, [response])
+                logger.debug("[AUTO] %d bytes", len(response))
 
             if ready:
                 try:
-                    data = os.read(master, 1024).decode('utf-8', errors='ignore')
-                    buffer += data
-
-                    # Process complete commands (lines ending with newline)
-                    while '\n' in buffer or '\r' in buffer:
-                        # Split on newline
-                        if '\n' in buffer:
-                            line, buffer = buffer.split('\n', 1)
-                        else:
-                            line, buffer = buffer.split('\r', 1)
-
-                        line = line.strip()
+                    # Drain everything the client has sent in as few reads as possible
+                    while True:
+                        try:
+                            chunk = os.read(master, READ_SIZE)
+                        except BlockingIOError:
+                            break
+                        if not chunk:
+                            break
+                        buffer += chunk
+
+                    # Process complete commands (lines ending with CR or LF) in one split;
+                    # the unterminated tail waits for the next read
+                    *lines, buffer = buffer.replace(b'\r', b'\n').split(b'\n')
+                    for line in lines:
+                        line = line.decode('utf-8', errors='ignore').strip()
                         if line:
-                            print(f"[RECV] {line}")
+                            logger.debug("[RECV] %s", line)
 
                             # Process command
                             response = teensy.handle_command(line)
 
-                            if response:
-                                os.write(master, response.encode())
-                                print(f"[SENT] {len(response)} bytes")
-
-                            # Send prompt
+                            # Send response and prompt together in one syscall
+                            chunks = [response] if response else []
                             if not teensy.auto_mode:
-                                os.write(master, b"VIA> ")
+                                chunks.append(PROMPT)
+                            if chunks:
+                                write_pty(master, chunks)
+
+                            if response:
+                                logger.debug("[SENT] %d bytes", len(response))
 
                 except OSError:
                     time.sleep(0.1)
 
-            time.sleep(0.01)
-
     except KeyboardInterrupt:
         print("\n\nShutting down virtual serial port...")
 
@@ -332,4 +391,6 @@ VIA> """
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG if '-v' in sys.argv[1:] else logging.INFO,
+                        format="%(message)s")
     run_virtual_serial()